@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import sys
+
+from pydoku.cli import main
+
+sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import sys
+import json
+import time
+import timeit
+from typing import Any, BinaryIO, Callable, NamedTuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from pydoku.sudoku import Sudoku
+from pydoku.loader import DataLoader, first_puzzle_line
+from pydoku.solver import Solver
+from pydoku.solver.registry import ENGINES, SOLVERS
+from pydoku.solver.routing import calibrate, extract_features, puzzle_class
+
+# Metrics compared against a baseline, by whether a higher value is better
+HIGHER_IS_BETTER: dict[str, bool] = {
+    "p50": False,
+    "p90": False,
+    "p99": False,
+    "max": False,
+    "puzzles_per_sec": True,
+    "nodes_per_sec": True,
+}
+
+
+class SolverReport(NamedTuple):
+    name: str
+    puzzles: int
+    solved: int
+    p50: float  # Latency percentiles and maximum in seconds
+    p90: float
+    p99: float
+    max: float
+    puzzles_per_sec: float
+    nodes_per_sec: float
+
+
+class LoaderReport(NamedTuple):
+    name: str
+    lines: int
+    lines_per_sec: float | None  # None when the loader cannot parse the corpus
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, 0 if unavailable."""
+    if resource is None:
+        return 0
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes while macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_corpus(fp: BinaryIO, limit: int = -1) -> np.ndarray:
+    """Load an `(N, cells)` puzzle corpus, sizing cells from the first puzzle."""
+    num_cells: int = len(first_puzzle_line(fp))
+    fp.seek(0)
+    if not num_cells:
+        return np.empty((0, 0), dtype=np.uint8)
+    chunks: list[np.ndarray] = []
+    count: int = 0
+    for chunk in DataLoader.load_file_to_chunks(fp, num_cells):
+        chunks.append(chunk)
+        count += len(chunk)
+        if 0 <= limit <= count:
+            break
+    if not chunks:
+        return np.empty((0, num_cells), dtype=np.uint8)
+    puzzles: np.ndarray = np.concatenate(chunks)
+    return puzzles[:limit] if limit >= 0 else puzzles
+
+
+def time_solver(
+    solver_cls: type[Solver],
+    puzzles: np.ndarray,
+    solver_kwargs: dict[str, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Per-puzzle latencies and solved flags, plus the total number of nodes."""
+    grids: np.ndarray = np.array(puzzles, dtype=np.uint8, copy=True)
+    latencies: np.ndarray = np.zeros(len(grids), dtype=np.float64)
+    solved: np.ndarray = np.zeros(len(grids), dtype=np.bool_)
+    nodes: int = 0
+    solver: Solver | None = None
+    for i, cells in enumerate(grids):
+        start: int = time.perf_counter_ns()
+        if solver is None:
+            solver = solver_cls(Sudoku.from_array(cells), **(solver_kwargs or {}))
+        else:
+            solver.reset(cells)
+        solver.setup()
+        solved[i] = bool(solver.solve())
+        latencies[i] = (time.perf_counter_ns() - start) * 1e-9
+        nodes += solver.num_nodes
+    return latencies, solved, nodes
+
+
+def summarize(
+    name: str, latencies: np.ndarray, solved: np.ndarray, nodes: int
+) -> SolverReport:
+    total: float = float(latencies.sum())
+    p50, p90, p99, p100 = (
+        np.percentile(latencies, [50, 90, 99, 100]) if len(latencies) else np.zeros(4)
+    )
+    return SolverReport(
+        name=name,
+        puzzles=len(latencies),
+        solved=int(solved.sum()),
+        p50=float(p50),
+        p90=float(p90),
+        p99=float(p99),
+        max=float(p100),
+        puzzles_per_sec=len(latencies) / total if total else 0.0,
+        nodes_per_sec=nodes / total if total else 0.0,
+    )
+
+
+def classify(puzzles: np.ndarray) -> list[str]:
+    """Routing class of every puzzle."""
+    return [
+        puzzle_class(extract_features(Sudoku.from_array(cells))) for cells in puzzles
+    ]
+
+
+def class_timings(
+    labels: list[str], timings: dict[str, tuple[np.ndarray, np.ndarray, int]]
+) -> dict[str, Any]:
+    """Puzzle count and per-solver solved count and mean latency of each class."""
+    classes: dict[str, Any] = {}
+    label_array: np.ndarray = np.array(labels)
+    for label in sorted(set(labels)):
+        mask: np.ndarray = label_array == label
+        classes[label] = {
+            "puzzles": int(mask.sum()),
+            "solvers": {
+                name: {
+                    "solved": int(solved[mask].sum()),
+                    "mean": float(latencies[mask].mean()),
+                }
+                for name, (latencies, solved, _) in timings.items()
+            },
+        }
+    return classes
+
+
+def benchmark_loaders(path: str, repeat: int = 5) -> list[LoaderReport]:
+    """Time the `DataLoader` paths profiled by `run_profile` over a file.
+
+    The native and numpy loaders only read plain digit lines, so corpora with
+    comments, `.` empties or letter cells report them as unsupported.
+    """
+    with open(path, "rb") as fp:
+        num_cells: int = len(first_puzzle_line(fp))
+        fp.seek(0)
+        num_lines: int = sum(1 for _ in fp)
+
+    def native() -> None:
+        with open(path) as fp:
+            for _ in DataLoader.load_file_to_native(fp):
+                pass
+
+    def numpy() -> None:
+        with open(path) as fp:
+            for _ in DataLoader.load_file_to_numpy(fp):
+                pass
+
+    def chunks() -> None:
+        with open(path, "rb") as fp:
+            for _ in DataLoader.load_file_to_chunks(fp, num_cells):
+                pass
+
+    loaders: dict[str, Callable[[], None]] = {
+        "native": native,
+        "numpy": numpy,
+        "chunks": chunks,
+    }
+    reports: list[LoaderReport] = []
+    for name, loader in loaders.items():
+        try:
+            best: float = min(timeit.repeat(loader, number=1, repeat=repeat))
+        except ValueError:
+            reports.append(LoaderReport(name, num_lines, None))
+            continue
+        reports.append(LoaderReport(name, num_lines, num_lines / best))
+    return reports
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.1
+) -> list[str]:
+    """Describe every solver metric that regressed past `threshold` of baseline."""
+    regressions: list[str] = []
+    previous: dict[str, dict] = {r["name"]: r for r in baseline.get("solvers", [])}
+    for current in report.get("solvers", []):
+        if (base := previous.get(current["name"])) is None:
+            continue
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            old: float = base.get(metric, 0)
+            new: float = current[metric]
+            if not old:
+                continue
+            change: float = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    f"{current['name']}.{metric}: {old:.6g} -> {new:.6g} "
+                    f"({change:+.1%})"
+                )
+    return regressions
+
+
+def run_suite(argv: list[str] | None = None, prog: str | None = None) -> None:
+    """Benchmark solvers over a corpus and write a json report."""
+    from argparse import ArgumentParser, FileType, Namespace
+
+    parser: ArgumentParser = ArgumentParser(prog=prog, description="benchmark solvers")
+    parser.add_argument("corpus", type=FileType("rb"), help="puzzle filepath")
+    parser.add_argument(
+        "-s",
+        "--solver",
+        action="append",
+        choices=sorted(SOLVERS),
+        help="solver to run (repeatable, default all exact solvers)",
+    )
+    parser.add_argument("-n", "--limit", type=int, default=-1, help="max puzzles")
+    parser.add_argument("-l", "--loaders", action="store_true", help="time loaders")
+    parser.add_argument("-o", "--output", type=FileType("w"), default=sys.stdout)
+    parser.add_argument("-b", "--baseline", type=FileType(), help="baseline json")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1)
+    parser.add_argument(
+        "-c",
+        "--calibrate",
+        type=FileType("w"),
+        help="write a routing table from per-class timings of the engines run",
+    )
+    args: Namespace = parser.parse_args(argv)
+
+    names: list[str] = args.solver or ["backtracking", "exactcover"]
+    with args.corpus as fp:
+        try:
+            puzzles: np.ndarray = load_corpus(fp, args.limit)
+        except ValueError as e:
+            parser.error(str(e))
+    if not len(puzzles):
+        parser.error(f"No puzzles loaded from {args.corpus.name}")
+    timings: dict[str, tuple[np.ndarray, np.ndarray, int]] = {
+        name: time_solver(SOLVERS[name], puzzles) for name in names
+    }
+    report: dict[str, Any] = {
+        "corpus": args.corpus.name,
+        "puzzles": len(puzzles),
+        "solvers": [summarize(name, *timings[name])._asdict() for name in names],
+        "classes": class_timings(classify(puzzles), timings),
+        # Process-wide high-water mark in bytes, shared by every solver run
+        "peak_rss": peak_rss(),
+    }
+    if args.calibrate is not None:
+        with args.calibrate as fp:
+            json.dump(calibrate(report, set(ENGINES)), fp, indent=2)
+            fp.write("\n")
+    if args.loaders:
+        report["loaders"] = [r._asdict() for r in benchmark_loaders(args.corpus.name)]
+    if args.baseline is not None:
+        baseline: dict[str, Any] = json.load(args.baseline)
+        report["regressions"] = compare(report, baseline, args.threshold)
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"regression: {regression}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_suite()
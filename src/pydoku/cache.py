@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.canonical import MAX_CANONICAL_BOX_SIZE, Transform, canonicalize
+from pydoku.solver.abc import Solver
+
+# Box sizes worth canonicalizing, 4x4 grids solve faster than they canonicalize
+CANONICAL_BOX_SIZES: range = range(3, MAX_CANONICAL_BOX_SIZE + 1)
+
+
+class SolutionCache:
+    """Bounded LRU cache of solutions keyed on canonical puzzle forms.
+
+    Puzzles equal up to relabelling, transposition and band/stack permutations
+    share one entry, and a hit is answered by un-transforming the cached
+    canonical solution. Unsolvable classes are cached as well.
+
+    Every puzzle is also kept under its own cells, so exact repeats skip
+    canonicalization. Puzzles that would cost more to canonicalize than to
+    solve are cached that way only: 4x4 grids, grids more than half given and
+    grids whose canonical form ties on more than `max_states` transforms,
+    like near-empty ones.
+    """
+
+    def __init__(
+        self,
+        solver_cls: type[Solver],
+        maxsize: int = 65536,
+        path: str | os.PathLike | None = None,
+        solver_kwargs: dict[str, Any] | None = None,
+        max_states: int = 1024,
+    ):
+        self.solver_cls: type[Solver] = solver_cls
+        self.solver_kwargs: dict[str, Any] = solver_kwargs or {}
+        self.maxsize: int = maxsize
+        self.max_states: int = max_states
+        self.path: str | os.PathLike | None = path
+        self.entries: OrderedDict[bytes, np.ndarray | None] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._solver: Solver | None = None
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def solve(self, sudoku: Sudoku) -> bool:
+        """Solve a sudoku in place, consulting the cache before the solver."""
+        exact: bytes = sudoku.cells.tobytes()
+        if exact in self.entries:
+            return self._hit(sudoku, exact)
+        canonical: tuple[np.ndarray, Transform] | None = self._canonicalize(sudoku)
+        if canonical is not None:
+            key: bytes = canonical[0].tobytes()
+            if key in self.entries:
+                return self._hit(sudoku, key, canonical[1])
+        self.misses += 1
+        solved: bool = self._solve(sudoku)
+        solution: np.ndarray | None = sudoku.cells.copy() if solved else None
+        if canonical is not None:
+            self._store(key, None if solution is None else canonical[1].apply(solution))
+        self._store(exact, solution)
+        return solved
+
+    def _canonicalize(self, sudoku: Sudoku) -> tuple[np.ndarray, Transform] | None:
+        if sudoku.box_size not in CANONICAL_BOX_SIZES:
+            return None
+        if 2 * sudoku.empty < sudoku.cells.size:
+            return None
+        try:
+            return canonicalize(sudoku, self.max_states, truncate=False)
+        except ValueError:
+            # Too many symmetric ties, solving is cheaper than canonicalizing
+            return None
+
+    def _hit(
+        self, sudoku: Sudoku, key: bytes, transform: Transform | None = None
+    ) -> bool:
+        self.hits += 1
+        self.entries.move_to_end(key)
+        solution: np.ndarray | None = self.entries[key]
+        if solution is None:
+            return False
+        if transform is not None:
+            solution = transform.invert(solution)
+        sudoku.cells[...] = solution
+        sudoku.refresh()
+        return True
+
+    def _solve(self, sudoku: Sudoku) -> bool:
+        if self._solver is None:
+            self._solver = self.solver_cls(sudoku, **self.solver_kwargs)
+        else:
+            self._solver.reset(sudoku)
+        self._solver.setup()
+        return bool(self._solver.solve())
+
+    def _store(self, key: bytes, solution: np.ndarray | None) -> None:
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def save(self, path: str | os.PathLike | None = None) -> None:
+        """Persist entries (least recently used first) as an `.npz` archive.
+
+        Grids of different sizes are stored back to back in flat buffers, with
+        the cell count of every entry in `sizes` to split them again.
+        """
+        if (path := path or self.path) is None:
+            raise ValueError("No path given to save the solution cache to")
+        keys: list[np.ndarray] = [np.frombuffer(k, np.uint8) for k in self.entries]
+        values: list[np.ndarray] = [
+            np.zeros(k.size, np.uint8) if v is None else v.reshape(-1)
+            for k, v in zip(keys, self.entries.values())
+        ]
+        sizes: np.ndarray = np.array([k.size for k in keys], np.int64)
+        with open(path, "wb") as fp:
+            np.savez_compressed(
+                fp,
+                puzzles=np.concatenate(keys or [np.empty(0, np.uint8)]),
+                solutions=np.concatenate(values or [np.empty(0, np.uint8)]),
+                sizes=sizes,
+            )
+
+    def load(self, path: str | os.PathLike) -> None:
+        """Load entries saved by `save`, keeping the most recent `maxsize`."""
+        with np.load(path) as archive:
+            puzzles: np.ndarray = archive["puzzles"]
+            solutions: np.ndarray = archive["solutions"]
+            sizes: np.ndarray = archive["sizes"]
+        start: int = 0
+        for size in sizes.tolist():
+            dim: int = int(np.sqrt(size))
+            key: bytes = puzzles[start : start + size].tobytes()
+            solution: np.ndarray = solutions[start : start + size]
+            self.entries[key] = solution.reshape(dim, dim) if solution.any() else None
+            start += size
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
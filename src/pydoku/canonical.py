@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import functools
+import itertools
+from typing import NamedTuple
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+
+# Column permutation tables grow as (d!)^(d + 1), so larger boxes are not supported
+MAX_CANONICAL_BOX_SIZE: int = 3
+
+
+class Transform(NamedTuple):
+    """Validity-preserving map from a grid to its canonical representative.
+
+    `canonical[i, j] == digits[grid[rows[i], cols[j]]]` with the grid first
+    transposed when `transpose` is set.
+    """
+
+    transpose: bool
+    rows: np.ndarray
+    cols: np.ndarray
+    digits: np.ndarray
+
+    def apply(self, cells: np.ndarray) -> np.ndarray:
+        grid: np.ndarray = cells.T if self.transpose else cells
+        return self.digits[grid[np.ix_(self.rows, self.cols)]].astype(np.uint8)
+
+    def invert(self, cells: np.ndarray) -> np.ndarray:
+        grid: np.ndarray = np.empty_like(cells)
+        grid[np.ix_(self.rows, self.cols)] = np.argsort(self.digits)[cells]
+        return grid.T if self.transpose else grid
+
+
+@functools.cache
+def column_permutations(box_size: int) -> np.ndarray:
+    """All column orders reachable by permuting stacks and columns within stacks."""
+    d: int = box_size
+    orders: list[list[int]] = []
+    inner: list[tuple[int, ...]] = list(itertools.permutations(range(d)))
+    for stacks in itertools.permutations(range(d)):
+        for within in itertools.product(inner, repeat=d):
+            orders.append([s * d + c for s, cols in zip(stacks, within) for c in cols])
+    return np.asarray(orders, dtype=np.intp)
+
+
+def place_values(grid_size: int) -> np.ndarray:
+    """Weights comparing rows of values up to `grid_size` as base n + 1 numbers."""
+    return np.power(grid_size + 1, np.arange(grid_size - 1, -1, -1))
+
+
+@functools.cache
+def column_weights(box_size: int) -> np.ndarray:
+    """`(orders, n)` place value each column order gives every column."""
+    perms: np.ndarray = column_permutations(box_size)
+    weights: np.ndarray = np.empty_like(perms)
+    np.put_along_axis(weights, perms, place_values(perms.shape[1]), axis=1)
+    return weights
+
+
+def canonicalize(
+    sudoku: Sudoku, max_states: int = 1 << 17, truncate: bool = True
+) -> tuple[np.ndarray, Transform]:
+    """Map a sudoku to the minimal grid of its symmetry class.
+
+    The class is generated by transposition, band and stack permutations, row
+    and column permutations within them and relabelling of the digits. Grids
+    are ordered by their clues per column, then row by row on the clues in the
+    row and its relabelled values, so the clue counts, which no relabelling
+    changes, prune most transforms before any row is relabelled. Rows of the
+    result are fixed one at a time, keeping every partial transform that ties
+    on the minimal prefix. Degenerate grids with more than `max_states` ties
+    are truncated deterministically instead, or rejected with a ValueError
+    when `truncate` is unset.
+    """
+    n: int = sudoku.grid_size
+    d: int = sudoku.box_size
+    if d > MAX_CANONICAL_BOX_SIZE:
+        raise ValueError(f"Canonical form is not supported for grid size: {n}")
+    grids: np.ndarray = np.stack([sudoku.cells, sudoku.cells.T]).astype(np.intp)
+    # Clues per row of each orientation, its columns being the other's rows
+    clues: np.ndarray = np.count_nonzero(grids, axis=2)
+    perms: np.ndarray = column_permutations(d)
+    place: np.ndarray = place_values(n)
+    band_of: np.ndarray = np.floor_divide(np.arange(n), d)
+    # Positions before each other position of a row, to find first appearances
+    earlier: np.ndarray = np.tri(n, k=-1, dtype=np.bool_)
+
+    # Only column orders with the minimal sequence of column clue counts remain
+    keys: np.ndarray = clues[::-1] @ column_weights(d).T
+    flip: np.ndarray
+    order: np.ndarray
+    flip, order = np.nonzero(keys == keys.min())
+
+    # Partial transforms: transpose flag, column order, chosen rows and labels
+    rows: np.ndarray = np.zeros((flip.size, n), dtype=np.intp)
+    used: np.ndarray = np.zeros((flip.size, n), dtype=np.bool_)
+    labels: np.ndarray = np.zeros((flip.size, n + 1), dtype=np.intp)
+    canon: np.ndarray = np.zeros((flip.size, n, n), dtype=np.intp)
+
+    for k in range(n):
+        # Rows may continue the current band or, at a band boundary, open a new one
+        if k % d:
+            allowed: np.ndarray = band_of == band_of[rows[:, k - 1, None]]
+        else:
+            bands: np.ndarray = used.reshape(-1, d, d).any(axis=2)
+            allowed = ~np.repeat(bands, d, axis=1)
+        state, row = np.nonzero(allowed & ~used)
+        row_clues: np.ndarray = clues[flip[state], row]
+        fewest: np.ndarray = row_clues == row_clues.min()
+        state, row = state[fewest], row[fewest]
+        if state.size > max_states and not truncate:
+            raise ValueError(f"Canonical form ties on over {max_states} transforms")
+        state, row = state[:max_states], row[:max_states]
+
+        # Relabel digits in order of first appearance along the candidate row
+        values: np.ndarray = grids[flip[state, None], row[:, None], perms[order[state]]]
+        relabel: np.ndarray = labels[state]
+        ar: np.ndarray = np.arange(state.size)[:, None]
+        repeated: np.ndarray = (
+            (values[:, :, None] == values[:, None, :]) & earlier
+        ).any(axis=2)
+        new: np.ndarray = (values != 0) & (relabel[ar, values] == 0) & ~repeated
+        ranks: np.ndarray = relabel.max(axis=1, keepdims=True) + np.cumsum(new, axis=1)
+        first: tuple[np.ndarray, ...] = np.nonzero(new)
+        relabel[first[0], values[first]] = ranks[first]
+        out: np.ndarray = relabel[ar, values]
+
+        # Keep only the candidates that tie on the minimal row
+        key: np.ndarray = out @ place
+        keep: np.ndarray = key == key.min()
+        chosen: np.ndarray = state[keep]
+        flip, order = flip[chosen], order[chosen]
+        rows, used, canon = rows[chosen], used[chosen], canon[chosen]
+        rows[:, k] = row[keep]
+        used[np.arange(chosen.size), row[keep]] = True
+        canon[:, k] = out[keep]
+        labels = relabel[keep]
+
+    # Digits absent from the grid take the remaining labels in increasing order
+    digits: np.ndarray = labels[0].copy()
+    missing: np.ndarray = np.flatnonzero(digits[1:] == 0) + 1
+    digits[missing] = np.arange(n - missing.size + 1, n + 1)
+    transform: Transform = Transform(
+        transpose=bool(flip[0]),
+        rows=rows[0],
+        cols=perms[order[0]],
+        digits=digits,
+    )
+    return canon[0].astype(np.uint8), transform
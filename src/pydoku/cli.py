@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import io
+import os
+import sys
+import logging
+import argparse
+from typing import TYPE_CHECKING, BinaryIO, Generator, Iterable, cast
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from pydoku.solver.abc import Solver
+
+# NumPy and the solvers are imported inside each command so that `--help`,
+# argument errors and process startup stay cheap for short-lived jobs
+logger: logging.Logger = logging.getLogger("pydoku")
+
+FORMATS: tuple[str, ...] = ("text", "csv", "json")
+
+
+def _inputs(paths: list[str]) -> Generator[BinaryIO, None, None]:
+    # `-` reads puzzles from standard input
+    for path in paths or ["-"]:
+        if path == "-":
+            yield sys.stdin.buffer
+        else:
+            with open(path, "rb") as fp:
+                yield fp
+
+
+def _load(fp: BinaryIO, chunk_size: int) -> Iterable["np.ndarray"]:
+    """Stream `(chunk, cells)` puzzles, sizing cells from the first puzzle line."""
+    from pydoku.loader import DataLoader
+
+    return DataLoader.load_stream_to_chunks(fp, chunk_size)
+
+
+def _solve_chunk(
+    puzzles: "np.ndarray", args: argparse.Namespace, state: dict[str, "Solver"]
+) -> tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    from pydoku.sudoku import Sudoku
+    from pydoku.solver.registry import get_solver
+
+    solver_cls = get_solver(args.solver)
+    if args.jobs != 1:
+        from pydoku.solver.parallel import solve_many
+
+        solutions: np.ndarray = np.empty_like(puzzles)
+        solved: np.ndarray = np.empty(len(puzzles), dtype=np.bool_)
+        for chunk in solve_many(
+            puzzles, solver_cls, workers=args.jobs or None, timeout=args.timeout
+        ):
+            stop: int = chunk.start + len(chunk.solutions)
+            solutions[chunk.start : stop] = chunk.solutions
+            solved[chunk.start : stop] = chunk.status["solved"]
+        return solutions, solved
+    # One solver reused across every puzzle of the run
+    solutions = np.array(puzzles, copy=True)
+    solved = np.zeros(len(puzzles), dtype=np.bool_)
+    for i, cells in enumerate(solutions):
+        if (solver := state.get("solver")) is None:
+            solver = state["solver"] = solver_cls(Sudoku.from_array(cells))
+        else:
+            solver.reset(cells)
+        solver.setup()
+        solved[i] = bool(solver.solve(timeout=args.timeout))
+    return solutions, solved
+
+
+def _write(
+    out: BinaryIO,
+    fmt: str,
+    puzzles: "np.ndarray",
+    solutions: "np.ndarray",
+    solved: "np.ndarray",
+) -> None:
+    import json
+
+    from pydoku.loader import encode_lines
+
+    if fmt == "text":
+        # Unsolved puzzles are echoed so every loaded puzzle keeps its line, while
+        # comments and malformed lines are dropped by the loader
+        for puzzle, solution, ok in zip(puzzles, solutions, solved):
+            out.write(encode_lines((solution if ok else puzzle)[None]))
+        return
+    given: list[str] = encode_lines(puzzles).decode().splitlines()
+    found: list[str] = encode_lines(solutions).decode().splitlines()
+    for puzzle, solution, ok in zip(given, found, solved.tolist()):
+        if fmt == "csv":
+            out.write(f"{puzzle},{solution if ok else ''},{ok}\n".encode())
+        else:
+            record: dict[str, str | None] = {
+                "puzzle": puzzle,
+                "solution": solution if ok else None,
+            }
+            out.write(json.dumps(record).encode() + b"\n")
+
+
+def solve(args: argparse.Namespace) -> int:
+    import time
+
+    from pydoku.solver.registry import get_solver
+
+    try:
+        get_solver(args.solver)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    out: BinaryIO = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    total: int = 0
+    unsolved: int = 0
+    state: dict[str, "Solver"] = {}
+    start: float = time.perf_counter()
+    try:
+        if args.format == "csv":
+            out.write(b"puzzle,solution,solved\n")
+        for fp in _inputs(args.files):
+            for puzzles in _load(fp, args.chunk_size):
+                solutions, solved = _solve_chunk(puzzles, args, state)
+                _write(out, args.format, puzzles, solutions, solved)
+                total += len(puzzles)
+                unsolved += int((~solved).sum())
+        out.flush()
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    elapsed: float = time.perf_counter() - start
+    logger.info(f"Solved {total - unsolved}/{total} puzzles in {elapsed:.3f}s")
+    return 1 if unsolved else 0
+
+
+def convert(args: argparse.Namespace) -> int:
+    from pydoku.loader import BINARY_MAGIC, DataLoader
+
+    fp: io.BufferedReader = (
+        open(args.input, "rb")
+        if args.input != "-"
+        else cast(io.BufferedReader, sys.stdin.buffer)
+    )
+    try:
+        binary: bool = fp.peek(len(BINARY_MAGIC)).startswith(BINARY_MAGIC)
+        if binary and (args.to == "binary" or args.input == "-"):
+            logger.error(f"Packed input must be a file converted to text: {args.input}")
+            return 2
+        if args.to == "binary":
+            if args.output == "-":
+                logger.error("Packed output needs a seekable file, not stdout")
+                return 2
+            count: int = DataLoader.write_binary(args.output, _load(fp, 65536))
+        else:
+            chunks: Iterable["np.ndarray"] = (
+                DataLoader.open_binary(args.input).iter_chunks()
+                if binary
+                else _load(fp, 65536)
+            )
+            if args.output == "-":
+                count = DataLoader.write_text(sys.stdout.buffer, chunks)
+            else:
+                with open(args.output, "wb") as out:
+                    count = DataLoader.write_text(out, chunks)
+    finally:
+        if fp is not sys.stdin.buffer:
+            fp.close()
+    logger.info(f"Converted {count} puzzles to {args.to}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pydoku", description="sudoku toolkit")
+    parser.add_argument("-V", "--version", action="store_true", help="print version")
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="log progress (repeatable)"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    solver = commands.add_parser("solve", help="solve puzzle files or stdin")
+    solver.add_argument("files", nargs="*", help="puzzle files, `-` for stdin")
+    solver.add_argument(
+        "-s", "--solver", default="auto", help="solver name (default: auto)"
+    )
+    solver.add_argument(
+        "-j", "--jobs", type=int, default=1, help="worker processes, 0 for all cores"
+    )
+    solver.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="one record per puzzle, malformed lines are skipped (default: text)",
+    )
+    solver.add_argument("-o", "--output", default="-", help="output file")
+    solver.add_argument("-t", "--timeout", type=float, help="seconds per puzzle")
+    solver.add_argument("--chunk-size", type=int, default=65536, help="chunk size")
+    solver.set_defaults(handler=solve)
+
+    converter = commands.add_parser("convert", help="convert text and packed files")
+    converter.add_argument("input", help="text or packed puzzle file, `-` for stdin")
+    converter.add_argument("output", help="output file, `-` for stdout")
+    converter.add_argument("--to", choices=("text", "binary"), default="binary")
+    converter.set_defaults(handler=convert)
+
+    # Options are parsed by the benchmark suite itself
+    commands.add_parser("bench", help="benchmark solvers, see `pydoku bench -h`")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    parser: argparse.ArgumentParser = build_parser()
+    if argv[:1] == ["bench"]:
+        from pydoku.benchmark import run_suite
+
+        run_suite(argv[1:], prog="pydoku bench")
+        return 0
+    args: argparse.Namespace = parser.parse_args(argv)
+    if args.version:
+        from pydoku import __version__
+
+        print(__version__)
+        return 0
+    if args.command is None:
+        parser.print_help()
+        return 2
+    logging.basicConfig(
+        level=max(logging.WARNING - 10 * args.verbose, logging.DEBUG),
+        datefmt="[%m-%d %H:%M:%S]",
+        format="%(asctime)s %(name)-16s %(levelname)-9s %(message)s",
+    )
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        # Malformed puzzles, such as a first line of an invalid length
+        logger.error(str(e))
+        return 2
+    except BrokenPipeError:
+        # The reader went away, as with `| head`, so drop the remaining output
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import multiprocessing as mp
+from typing import Any, Generator
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.geometry import geometry
+from pydoku.solver.exactcover import ExactCoverSolver
+
+# Clue layouts kept invariant while digging, by the cell map each one applies
+SYMMETRIES: tuple[str, ...] = ("none", "rotational", "diagonal", "mirror")
+FILLS: tuple[str, ...] = ("random", "pattern")
+
+
+def symmetry_orbits(grid_size: int, symmetry: str = "none") -> list[np.ndarray]:
+    """Groups of flat cell indices that are cleared together under a symmetry."""
+    cells: np.ndarray = geometry(grid_size).row_cells
+    if symmetry == "none":
+        image: np.ndarray = cells
+    elif symmetry == "rotational":
+        image = cells[::-1, ::-1]
+    elif symmetry == "diagonal":
+        image = cells.T
+    elif symmetry == "mirror":
+        image = cells[:, ::-1]
+    else:
+        raise ValueError(f"Unknown symmetry: {symmetry}")
+    pairs: np.ndarray = np.sort(np.stack([cells, image], axis=-1).reshape(-1, 2))
+    return [np.unique(pair) for pair in np.unique(pairs, axis=0)]
+
+
+class PuzzleGenerator:
+    """Produce puzzles with a unique solution from randomly transformed grids.
+
+    A solved grid comes either from solving randomly filled diagonal boxes or
+    from a fixed pattern, and is shuffled by relabelling digits, permuting
+    bands, stacks, rows, columns and transposing. Clues are then removed one
+    symmetry orbit at a time in random order, keeping a removal only while the
+    puzzle stays unique, until `clues` remain or no orbit can be removed.
+    """
+
+    def __init__(
+        self,
+        box_size: int = 3,
+        clues: int | None = None,
+        symmetry: str = "none",
+        fill: str = "random",
+    ):
+        if fill not in FILLS:
+            raise ValueError(f"Unknown fill: {fill}")
+        self.box_size: int = box_size
+        self.grid_size: int = box_size * box_size
+        # Target number of clues, or as few as possible if None
+        self.clues: int = clues or 0
+        self.symmetry: str = symmetry
+        self.fill: str = fill
+        self.orbits: list[np.ndarray] = symmetry_orbits(self.grid_size, symmetry)
+        self._solver: ExactCoverSolver | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Workers build their own solver rather than unpickling link buffers
+        return {**self.__dict__, "_solver": None}
+
+    def generate(self, rng: np.random.Generator) -> np.ndarray:
+        """Generate one `(cells,)` uint8 puzzle."""
+        return self.dig(self.solved_grid(rng), rng)
+
+    def solved_grid(self, rng: np.random.Generator) -> np.ndarray:
+        """Generate a random `(cells,)` uint8 solved grid."""
+        n: int = self.grid_size
+        d: int = self.box_size
+        if self.fill == "pattern":
+            rows, cols = np.divmod(np.arange(n * n), n)
+            grid: np.ndarray = (d * (rows % d) + rows // d + cols) % n + 1
+        else:
+            # Diagonal boxes share no unit so any fill of them can be completed
+            grid = np.zeros((n, n), dtype=np.uint8)
+            for box in range(d):
+                block: slice = slice(box * d, (box + 1) * d)
+                grid[block, block] = rng.permutation(np.arange(1, n + 1)).reshape(d, d)
+            grid = grid.reshape(-1)
+            solver: ExactCoverSolver = self._reset_solver(grid)
+            solver.setup()
+            if not solver.solve():
+                raise RuntimeError("Failed to complete a grid from its diagonal boxes")
+        return self._shuffle(grid, rng)
+
+    def dig(self, grid: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Remove clues from a solved grid while its solution stays unique."""
+        puzzle: np.ndarray = grid.copy()
+        clues: int = puzzle.size
+        for idx in rng.permutation(len(self.orbits)):
+            if clues <= self.clues:
+                break
+            orbit: np.ndarray = self.orbits[idx]
+            if clues - orbit.size < self.clues:
+                continue
+            puzzle[orbit] = 0
+            if self._forced(puzzle, orbit) or self._unique(puzzle):
+                clues -= orbit.size
+            else:
+                puzzle[orbit] = grid[orbit]
+        return puzzle
+
+    def _shuffle(self, grid: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # Validity-preserving relabelling, line permutations and transposition
+        n: int = self.grid_size
+        d: int = self.box_size
+        digits: np.ndarray = np.concatenate([[0], rng.permutation(n) + 1])
+        lines: list[np.ndarray] = [
+            (
+                rng.permutation(d)[:, None] * d
+                + rng.permuted(np.tile(np.arange(d), (d, 1)), axis=1)
+            ).reshape(-1)
+            for _ in range(2)
+        ]
+        shuffled: np.ndarray = grid.reshape(n, n)[np.ix_(*lines)]
+        if rng.random() < 0.5:
+            shuffled = shuffled.T
+        return digits[shuffled].astype(np.uint8).reshape(-1)
+
+    def _forced(self, puzzle: np.ndarray, orbit: np.ndarray) -> bool:
+        # Cleared cells that are naked singles keep the puzzle unique without search
+        n: int = self.grid_size
+        peers: np.ndarray = geometry(n).peers[orbit]
+        for values in puzzle[peers]:
+            if np.count_nonzero(np.bincount(values, minlength=n + 1)[1:]) != n - 1:
+                return False
+        return True
+
+    def _unique(self, puzzle: np.ndarray) -> bool:
+        solver: ExactCoverSolver = self._reset_solver(puzzle)
+        solver.setup()
+        return solver.has_unique_solution()
+
+    def _reset_solver(self, cells: np.ndarray) -> ExactCoverSolver:
+        if self._solver is None:
+            self._solver = ExactCoverSolver(Sudoku.from_array(cells))
+        else:
+            self._solver.reset(cells)
+        return self._solver
+
+
+# Generator configuration installed once per worker process by the pool initializer
+_worker: dict[str, Any] = {}
+
+
+def _attach_worker(generator: PuzzleGenerator, entropy: int) -> None:
+    _worker["generator"] = generator
+    _worker["entropy"] = entropy
+
+
+def _generate_range(bounds: tuple[int, int]) -> np.ndarray:
+    generator: PuzzleGenerator = _worker["generator"]
+    puzzles: np.ndarray = np.empty(
+        (bounds[1] - bounds[0], generator.grid_size**2), dtype=np.uint8
+    )
+    for row, i in enumerate(range(*bounds)):
+        seed: np.random.SeedSequence = np.random.SeedSequence(
+            _worker["entropy"], spawn_key=(i,)
+        )
+        puzzles[row] = generator.generate(np.random.default_rng(seed))
+    return puzzles
+
+
+def generate_many(
+    count: int,
+    generator: PuzzleGenerator | None = None,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> Generator[np.ndarray, None, None]:
+    """Generate `count` puzzles across a process pool, yielding `(chunk, cells)`.
+
+    Puzzle `i` draws from its own stream spawned from `seed`, so the output is
+    reproducible regardless of the number of workers or the chunk size. Chunks
+    are yielded in order and can be passed straight to `DataLoader.write_text`.
+    """
+    generator = generator or PuzzleGenerator()
+    entropy: int = np.random.SeedSequence(seed).entropy  # type: ignore[assignment]
+    bounds: list[tuple[int, int]] = [
+        (i, min(i + chunk_size, count)) for i in range(0, count, chunk_size)
+    ]
+    if workers == 1:
+        _attach_worker(generator, entropy)
+        yield from map(_generate_range, bounds)
+        return
+    initargs: tuple = (generator, entropy)
+    with mp.Pool(workers or os.cpu_count(), _attach_worker, initargs) as pool:
+        yield from pool.imap(_generate_range, bounds)
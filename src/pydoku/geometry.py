@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import math
+import functools
+
+import numpy as np
+
+# Grid sizes the text and binary formats can hold, one per box size 2..5
+GRID_SIZES: tuple[int, ...] = (4, 9, 16, 25)
+
+
+class Geometry:
+    """Flat cell index tables of one grid size, shared through `geometry()`.
+
+    Cells are numbered row-major from 0 to `n * n - 1`, boxes likewise from
+    the top-left. Every table is a read-only array built once per grid size.
+    """
+
+    __slots__ = (
+        "grid_size",
+        "box_size",
+        "num_cells",
+        "rows",
+        "cols",
+        "boxes",
+        "coords",
+        "row_cells",
+        "col_cells",
+        "box_cells",
+        "units",
+        "box_origins",
+        "peers",
+    )
+
+    def __init__(self, grid_size: int):
+        box_size: int = math.isqrt(grid_size)
+        if grid_size < 1 or box_size * box_size != grid_size:
+            raise ValueError(f"Grid size is not a square number: {grid_size}")
+        n: int = grid_size
+        d: int = box_size
+        cells: np.ndarray = np.arange(n * n)
+        self.grid_size: int = n
+        self.box_size: int = d
+        self.num_cells: int = n * n
+        # Row, column and box number of every cell, and `(cells, 2)` coordinates
+        self.rows, self.cols = np.divmod(cells, n)
+        self.boxes: np.ndarray = self.rows // d * d + self.cols // d
+        self.coords: np.ndarray = np.stack([self.rows, self.cols], axis=-1)
+        # `(n, n)` cells of every unit, boxes listed in row-major order
+        self.row_cells: np.ndarray = cells.reshape(n, n)
+        self.col_cells: np.ndarray = np.ascontiguousarray(self.row_cells.T)
+        self.box_cells: np.ndarray = np.argsort(self.boxes, kind="stable").reshape(n, n)
+        self.units: np.ndarray = np.concatenate(
+            [self.row_cells, self.col_cells, self.box_cells]
+        )
+        self.box_origins: np.ndarray = self.coords[self.box_cells[:, 0]]
+        # `(cells, 3n - 2d - 1)` cells sharing a unit with each cell, ascending
+        shared: np.ndarray = (
+            (self.rows[:, None] == self.rows)
+            | (self.cols[:, None] == self.cols)
+            | (self.boxes[:, None] == self.boxes)
+        )
+        np.fill_diagonal(shared, False)
+        self.peers: np.ndarray = np.nonzero(shared)[1].reshape(n * n, -1)
+        for name in self.__slots__[3:]:
+            getattr(self, name).flags.writeable = False
+
+    def __repr__(self) -> str:
+        return f"Geometry({self.grid_size})"
+
+    def __reduce__(self) -> tuple:
+        # Unpickles to the shared instance of the receiving process
+        return geometry, (self.grid_size,)
+
+
+@functools.cache
+def geometry(grid_size: int) -> Geometry:
+    """Shared geometry of a grid size, built on first use."""
+    return Geometry(grid_size)
+
+
+def cells_geometry(num_cells: int) -> Geometry:
+    """Geometry of puzzles with `num_cells` cells, validating the count."""
+    box_size: int = math.isqrt(math.isqrt(num_cells))
+    if num_cells == 0 or (box_size * box_size) ** 2 != num_cells:
+        raise ValueError(f"Puzzle has invalid number of cells: {num_cells}")
+    return geometry(box_size * box_size)
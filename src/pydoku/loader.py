@@ -1,12 +1,124 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
-from typing import Generator
+from typing import BinaryIO, Generator, Iterable
 from io import TextIOWrapper
+import os
 import math
+import struct
 
 import numpy as np
 
+from pydoku.geometry import cells_geometry
+
+# Binary puzzle header: magic, version, grid size, bits per cell, count
+BINARY_MAGIC: bytes = b"PDKU"
+BINARY_VERSION: int = 1
+BINARY_HEADER: struct.Struct = struct.Struct("<4sBBBxQ")
+
+# Characters for cell values 0..25 in the line-oriented text format
+CELL_ALPHABET: bytes = b"0123456789ABCDEFGHIJKLMNOP"
+# Byte value marking characters that cannot appear in a puzzle line
+INVALID_CELL: int = 255
+
+
+class BinaryPuzzles:
+    """Memory-mapped packed puzzle file exposing `(N, cells)` uint8 puzzles.
+
+    Grids with values up to 15 (4x4 and 9x9) are nibble-packed with the first
+    cell of each pair in the high nibble and one padding nibble for odd sizes.
+    Larger grids store a byte per cell, so slicing returns zero-copy views.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as fp:
+            header: bytes = fp.read(BINARY_HEADER.size)
+        magic, version, grid_size, bits, count = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"Not a packed puzzle file: {path}")
+        self.grid_size: int = grid_size
+        self.num_cells: int = grid_size * grid_size
+        self.bits: int = bits
+        self.count: int = count
+        row_bytes: int = packed_row_bytes(self.num_cells, bits)
+        if count == 0:
+            self.packed: np.ndarray = np.empty((0, row_bytes), dtype=np.uint8)
+            return
+        self.packed = np.memmap(
+            path,
+            dtype=np.uint8,
+            mode="r",
+            offset=BINARY_HEADER.size,
+            shape=(count, row_bytes),
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int | slice) -> np.ndarray:
+        rows: np.ndarray = np.atleast_2d(self.packed[idx])
+        if self.bits == 8:
+            return rows
+        return unpack_cells(rows, self.num_cells)
+
+    def iter_chunks(self, chunk_size: int = 65536) -> Generator[np.ndarray, None, None]:
+        """Generate `(chunk, cells)` uint8 arrays over the whole file."""
+        for start in range(0, self.count, chunk_size):
+            yield self[start : start + chunk_size]
+
+
+def cell_lookup(grid_size: int) -> np.ndarray:
+    """Byte to cell value table: `0`/`.` empty, digits, then letters from 10."""
+    lookup: np.ndarray = np.full(256, INVALID_CELL, dtype=np.uint8)
+    lookup[ord(".")] = 0
+    for value, char in enumerate(CELL_ALPHABET[: grid_size + 1]):
+        lookup[char] = lookup[ord(chr(char).lower())] = value
+    return lookup
+
+
+def encode_lines(puzzles: np.ndarray) -> bytes:
+    """Encode `(N, cells)` uint8 puzzles as newline-terminated text lines."""
+    alphabet: np.ndarray = np.frombuffer(CELL_ALPHABET, dtype=np.uint8)
+    lines: np.ndarray = np.empty((puzzles.shape[0], puzzles.shape[1] + 1), np.uint8)
+    lines[:, :-1] = alphabet[puzzles]
+    lines[:, -1] = ord("\n")
+    return lines.tobytes()
+
+
+def first_puzzle_line(fp: BinaryIO) -> bytes:
+    """Read up to the first line that is not blank or a `#` comment, stripped."""
+    for line in fp:
+        if (puzzle := line.strip()) and not puzzle.startswith(b"#"):
+            return puzzle
+    return b""
+
+
+def cell_bits(grid_size: int) -> int:
+    """Bits used per cell on disk for a given grid size."""
+    return 4 if grid_size < 16 else 8
+
+
+def packed_row_bytes(num_cells: int, bits: int) -> int:
+    """Bytes used on disk per puzzle."""
+    return (num_cells * bits + 7) // 8
+
+
+def pack_cells(puzzles: np.ndarray, bits: int) -> np.ndarray:
+    """Pack `(N, cells)` uint8 puzzles into their on-disk row layout."""
+    if bits == 8:
+        return np.ascontiguousarray(puzzles, dtype=np.uint8)
+    if puzzles.shape[1] % 2:
+        puzzles = np.pad(puzzles, ((0, 0), (0, 1)))
+    return (puzzles[:, 0::2] << 4) | puzzles[:, 1::2]
+
+
+def unpack_cells(packed: np.ndarray, num_cells: int) -> np.ndarray:
+    """Unpack nibble-packed rows back into `(N, cells)` uint8 puzzles."""
+    puzzles: np.ndarray = np.empty((packed.shape[0], packed.shape[1] * 2), np.uint8)
+    puzzles[:, 0::2] = packed >> 4
+    puzzles[:, 1::2] = packed & 0x0F
+    return puzzles[:, :num_cells]
+
 
 class DataLoader:
     @classmethod
@@ -44,6 +156,117 @@ class DataLoader:
                 raise ValueError(f"Puzzle has invalid length: {len(puzzle)}")
             yield np.asarray([int(cell) for cell in puzzle], dtype=np.uint8)
 
+    @classmethod
+    def load_file_to_chunks(
+        cls,
+        fp: BinaryIO | TextIOWrapper,
+        num_cells: int = 81,
+        chunk_size: int = 65536,
+        block_size: int = 1 << 23,
+        prefix: bytes = b"",
+    ) -> Generator[np.ndarray, None, None]:
+        """Generate `(chunk, cells)` uint8 puzzles decoded from large byte blocks.
+
+        Comment lines and lines of the wrong length or alphabet are dropped.
+        `prefix` holds bytes already read off the stream, decoded ahead of it.
+        """
+        raw: BinaryIO = fp.buffer if isinstance(fp, TextIOWrapper) else fp
+        lookup: np.ndarray = cell_lookup(cells_geometry(num_cells).grid_size)
+        pending: list[np.ndarray] = []
+        num_pending: int = 0
+        tail: bytes = prefix
+        while True:
+            block: bytes = raw.read(block_size)
+            data: bytes = tail + block
+            if not block:
+                data += b"\n" if data else b""
+            buffer: np.ndarray = np.frombuffer(data, dtype=np.uint8)
+            ends: np.ndarray = np.flatnonzero(buffer == ord("\n"))
+            # The last partial line carries over into the next block
+            tail = data[ends[-1] + 1 :] if ends.size else data
+            if ends.size:
+                starts: np.ndarray = np.concatenate(([0], ends[:-1] + 1))
+                lengths: np.ndarray = ends - starts
+                crlf: np.ndarray = buffer[np.maximum(ends - 1, 0)] == ord("\r")
+                lengths -= crlf & (lengths > 0)
+                starts = starts[lengths == num_cells]
+                # Rows of a zero-copy sliding window gather each line's cells at once
+                window: np.ndarray = np.lib.stride_tricks.sliding_window_view(
+                    buffer, min(num_cells, buffer.size)
+                )
+                cells: np.ndarray = lookup[window[starts]]
+                puzzles: np.ndarray = cells[np.all(cells != INVALID_CELL, axis=1)]
+                if puzzles.size:
+                    pending.append(puzzles)
+                    num_pending += puzzles.shape[0]
+            while num_pending >= chunk_size or (not block and num_pending):
+                merged: np.ndarray = np.concatenate(pending)
+                yield merged[:chunk_size]
+                pending = [merged[chunk_size:]]
+                num_pending = pending[0].shape[0]
+            if not block:
+                return
+
+    @classmethod
+    def load_stream_to_chunks(
+        cls, fp: BinaryIO, chunk_size: int = 65536
+    ) -> Generator[np.ndarray, None, None]:
+        """Generate `(chunk, cells)` puzzles, sizing cells from the first puzzle.
+
+        The stream is read once, so pipes such as stdin work as well as files.
+        """
+        first: bytes = first_puzzle_line(fp)
+        if first:
+            yield from cls.load_file_to_chunks(
+                fp, len(first), chunk_size, prefix=first + b"\n"
+            )
+
+    @classmethod
+    def write_text(cls, fp: BinaryIO, chunks: Iterable[np.ndarray]) -> int:
+        """Stream `(N, cells)` puzzle chunks as text lines, returning count."""
+        count: int = 0
+        for chunk in chunks:
+            fp.write(encode_lines(np.atleast_2d(chunk)))
+            count += len(chunk)
+        return count
+
+    @classmethod
+    def write_binary(cls, path: str | os.PathLike, chunks: Iterable[np.ndarray]) -> int:
+        """Stream `(N, cells)` puzzle chunks into a packed file, returning count."""
+        count: int = 0
+        grid_size: int = 0
+        with open(path, "wb") as fp:
+            fp.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0, 0))
+            for chunk in chunks:
+                chunk = np.atleast_2d(np.asarray(chunk, dtype=np.uint8))
+                if chunk.shape[0] == 0:
+                    continue
+                if grid_size == 0:
+                    grid_size = cells_geometry(chunk.shape[1]).grid_size
+                elif chunk.shape[1] != grid_size * grid_size:
+                    raise ValueError(f"Puzzle has invalid length: {chunk.shape[1]}")
+                fp.write(pack_cells(chunk, cell_bits(grid_size)).tobytes())
+                count += chunk.shape[0]
+            # Header is patched once the number of puzzles is known
+            bits: int = cell_bits(grid_size)
+            fp.seek(0)
+            fp.write(
+                BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, grid_size, bits, count)
+            )
+        return count
+
+    @classmethod
+    def open_binary(cls, path: str | os.PathLike) -> BinaryPuzzles:
+        """Memory-map a packed puzzle file written by `write_binary`."""
+        return BinaryPuzzles(path)
+
+    @classmethod
+    def convert_text_to_binary(
+        cls, fp: TextIOWrapper, path: str | os.PathLike, chunk_size: int = 65536
+    ) -> int:
+        """Convert a text puzzle file into the packed format, returning count."""
+        return cls.write_binary(path, cls.load_stream_to_chunks(fp.buffer, chunk_size))
+
 
 def run_profile() -> None:
     """Container method for poetry scripting."""
@@ -64,6 +287,10 @@ def run_profile() -> None:
     def exhaust_numpy_loader(parser: ArgumentParser = parser) -> None:
         [_ for _ in DataLoader.load_file_to_numpy(parser.parse_args().f)]
 
+    def exhaust_chunks_loader(parser: ArgumentParser = parser) -> None:
+        with open(parser.parse_args().f.name, "rb") as fp:
+            [_ for _ in DataLoader.load_file_to_chunks(fp)]
+
     print(f"  file: {parser.parse_args().f.name} has {num_lines} lines")
     t_native: list = timeit.repeat(number=1, repeat=repeats, stmt=exhaust_native_loader)
     print(f"native: {num_lines / np.mean(t_native):.6f} lines/sec")
@@ -71,12 +298,16 @@ def run_profile() -> None:
     t_numpy: list = timeit.repeat(number=1, repeat=repeats, stmt=exhaust_numpy_loader)
     print(f" numpy: {num_lines / np.mean(t_numpy):.6f} lines/sec")
     print(f"        {np.mean(t_numpy) / num_lines:.6f} secs/line")
+    t_chunks: list = timeit.repeat(number=1, repeat=repeats, stmt=exhaust_chunks_loader)
+    print(f"chunks: {num_lines / np.mean(t_chunks):.6f} lines/sec")
+    print(f"        {np.mean(t_chunks) / num_lines:.6f} secs/line")
 
     if args.o:
         with open("profile_loader.csv", "w") as fp:
-            fp.write("native_loader,numpy_loader\n")
+            fp.write("native_loader,numpy_loader,chunks_loader\n")
             for i in range(1, repeats):
-                fp.write(f"{t_native[i] / num_lines:.9f},{t_numpy[i] / num_lines:.9f}\n")
+                t_lines: list[float] = [t_native[i], t_numpy[i], t_chunks[i]]
+                fp.write(",".join(f"{t / num_lines:.9f}" for t in t_lines) + "\n")
 
 
 if __name__ == "__main__":
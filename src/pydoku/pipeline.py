@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import csv
+import time
+import queue
+import threading
+from io import TextIOWrapper
+from typing import Any, BinaryIO, Generator, Iterable, NamedTuple, TypeVar
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.loader import encode_lines
+from pydoku.solver.abc import Solver
+from pydoku.validation import validate_many
+
+T = TypeVar("T")
+
+# Per-puzzle outcome and phase timings recorded by the solve stage
+RESULT_DTYPE: np.dtype = np.dtype(
+    [
+        ("solved", np.bool_),
+        ("total", np.float64),
+        ("setup", np.float64),
+        ("solve", np.float64),
+        ("check", np.float64),
+    ]
+)
+RESULT_COLUMNS: list[str] = [
+    "IsSolved",
+    "TotalTime",
+    "SetupTime",
+    "SolveTime",
+    "CheckTime",
+]
+
+
+class ResultChunk(NamedTuple):
+    start: int  # Index of the first puzzle of the chunk in the stream
+    solutions: np.ndarray  # (chunk, cells) uint8 grids
+    results: np.ndarray  # (chunk,) RESULT_DTYPE records
+
+
+_END: Any = object()
+
+
+def prefetch(items: Iterable[T], depth: int = 2) -> Generator[T, None, None]:
+    """Produce items on a background thread with at most `depth` buffered.
+
+    The bounded queue applies backpressure, so the producer blocks once the
+    consumer falls `depth` items behind instead of growing memory.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop: threading.Event = threading.Event()
+    errors: list[BaseException] = []
+
+    def put(item: Any) -> bool:
+        # Wake up periodically so an abandoned consumer releases the producer
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        put(_END)
+
+    thread: threading.Thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while (item := buffer.get()) is not _END:
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+
+
+def solve_chunks(
+    chunks: Iterable[np.ndarray],
+    solver_cls: type[Solver],
+    solver_kwargs: dict[str, Any] | None = None,
+) -> Generator[ResultChunk, None, None]:
+    """Solve each `(chunk, cells)` array and yield its solutions and timings."""
+    start: int = 0
+    solver: Solver | None = None
+    for puzzles in chunks:
+        solutions: np.ndarray = np.array(puzzles, dtype=np.uint8, copy=True)
+        results: np.ndarray = np.zeros(solutions.shape[0], dtype=RESULT_DTYPE)
+        for i, cells in enumerate(solutions):
+            t_start: float = time.perf_counter()
+            if solver is None:
+                solver = solver_cls(Sudoku.from_array(cells), **(solver_kwargs or {}))
+            else:
+                solver.reset(cells)
+            t_setup: float = time.perf_counter()
+            solver.setup()
+            t_solve: float = time.perf_counter()
+            solver.solve()
+            t_end: float = time.perf_counter()
+            results[i] = (False, t_end - t_start, t_solve - t_setup, t_end - t_solve, 0)
+        # One vectorized check per chunk, its cost shared evenly between puzzles
+        t_check: float = time.perf_counter()
+        results["solved"] = validate_many(solutions)
+        results["check"] = (time.perf_counter() - t_check) / max(len(results), 1)
+        results["total"] += results["check"]
+        yield ResultChunk(start, solutions, results)
+        start += solutions.shape[0]
+
+
+def write_results(
+    results: Iterable[ResultChunk],
+    profile: TextIOWrapper | None = None,
+    solutions: BinaryIO | None = None,
+) -> int:
+    """Write timings as csv rows and solutions as text lines, flushing per chunk."""
+    if profile is not None:
+        csv.writer(profile).writerow(["PuzzleId", *RESULT_COLUMNS])
+    count: int = 0
+    for chunk in results:
+        if profile is not None:
+            ids: range = range(chunk.start + 1, chunk.start + len(chunk.results) + 1)
+            columns: list[list] = [
+                chunk.results[field].tolist() for field in RESULT_DTYPE.fields or ()
+            ]
+            csv.writer(profile).writerows(zip(ids, *columns))
+            profile.flush()
+        if solutions is not None:
+            solutions.write(encode_lines(chunk.solutions))
+            solutions.flush()
+        count += len(chunk.results)
+    return count
@@ -28,36 +28,6 @@ class Puzzle(abc.ABC):
         pass
 
 
-# import itertools
-
-# # import numpy as np
-
-# # MISSING_CELL: int = 0
-# puzzle_grid_size = 9
-# puzzle_subsquare_size = 3
-
-
-# def _generate_row_idxs(dim: int) -> list[int]:
-#     """Generate row numbers per index given by cell dimensions."""
-#     return list(itertools.chain(*[itertools.repeat(x, dim**2) for x in range(dim**2)]))
-
-
-# def _generate_col_idxs(cell_dim: int) -> list[int]:
-#     """Generate col numbers per index given by cell dimensions."""
-#     return list(itertools.chain(*itertools.repeat(range(cell_dim**2), cell_dim**2)))
-
-#     # def _generate_box_idxs(cell_dim: int) -> list[int]:
-#     #     """Generate box numbers per index given by cell dimensions."""
-#     #     rows: list[list[int]] = []
-#     #     for x in range(cell_dim):
-#     #         rows.extend(x)
-#     #     return rows
-
-#     return list(
-#         itertools.chain(*[itertools.repeat(x, cell_dim) for x in range(cell_dim)])
-#     )
-
-
 # #     def __str__(self) -> str:
 # #         s = ""
 # #         for i in range(self.dim_bx):
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+from pydoku.solver import ExactCoverSolver
+from benchmark_utils import run_benchmark  # type: ignore
+
+
+if __name__ == "__main__":
+    run_benchmark(ExactCoverSolver, "benchmark_exactcover.csv")
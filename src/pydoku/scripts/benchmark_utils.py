@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
-import io
-import re
 import time
 import logging
 import argparse
+from typing import Iterable, Iterator
+
+from pydoku.loader import DataLoader
+from pydoku.pipeline import ResultChunk, prefetch, solve_chunks, write_results
+from pydoku.solver import Solver
+from pydoku.solver.registry import SOLVERS
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -18,15 +22,15 @@ logger: logging.Logger = logging.getLogger("benchmarker")
 
 class Timer:
     def __enter__(self) -> "Timer":
-        self.start: float = time.time()
+        self.start: float = time.perf_counter()
         return self
 
     def __exit__(self, *args) -> None:
-        self.end: float = time.time()
+        self.end: float = time.perf_counter()
         self.interval: float = self.end - self.start
 
     def get_time(self) -> float:
-        return time.time() - self.start
+        return time.perf_counter() - self.start
 
     def __repr__(self) -> str:
         return f"{self.interval:>.6f}"
@@ -35,43 +39,28 @@ class Timer:
         return f"{self.interval:>.6f}"
 
 
-class PuzzleLoader:
-    VALID_PUZZLE_SIZES: list[int] = [16, 81, 256, 625]
-
-    @classmethod
-    def load_puzzles(cls, nmax: int = -1) -> list[list[int]]:
-        parser = argparse.ArgumentParser()
-        parser.add_argument("filepath", type=argparse.FileType(), help="sudoku datafile")
-        return cls.load_file(parser.parse_args().filepath, nmax)
+def run_benchmark(solver_cls: type[Solver], output: str) -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filepath", type=argparse.FileType("rb"), help="sudoku file")
+    parser.add_argument("--chunk-size", type=int, default=100, help="chunk size")
+    parser.add_argument("--output", default=output, help="profile csv filepath")
+    parser.add_argument("--solver", choices=SOLVERS, help="solver name to run instead")
+    args: argparse.Namespace = parser.parse_args()
+    if args.solver is not None:
+        solver_cls = SOLVERS[args.solver]
+    logger.info(f"Streaming puzzles from file: {args.filepath.name}")
 
-    @classmethod
-    def load_file(cls, file: io.TextIOWrapper, nmax: int = -1) -> list[list[int]]:
-        # Prepare loading file contents reading all lines
-        logger.info(f"Loading puzzles from file: {file.name}")
-        file_lines: list[str] = file.readlines()
-        logger.info(f"Loading {len(file_lines)} lines from file")
-        nmax = nmax if nmax > 0 else len(file_lines)
-        # Populate return list of integer problems
-        puzzles: list[list[int]] = []
-        for line_no, line in enumerate(file_lines):
-            try:
-                if (puzzle := cls.normalise_puzzle(line)) is not None:
-                    puzzles.append(puzzle)
-                else:
-                    logger.info(f"Skipping contents on line {line_no + 1}")
-            except ValueError as e:
-                logger.warning(f"Skipping contents on line {line_no + 1} -> {e}")
-            if len(puzzles) % 100000 == 0 and len(puzzles) != 0:
-                logger.info(f"Loaded {len(puzzles):>9d} puzzles")
-        logger.info(f"Loaded all {len(puzzles)} puzzles into memory")
-        return puzzles
+    def log_progress(results: Iterable[ResultChunk]) -> Iterator[ResultChunk]:
+        for chunk in results:
+            solved: int = chunk.start + len(chunk.results)
+            logger.info(f"Solved {solved:>9d} puzzles")
+            rate: float = solved / loop_timer.get_time()
+            logger.info(f"Intermediate result: {rate} puzzles/s")
+            yield chunk
 
-    @classmethod
-    def normalise_puzzle(cls, puzzle: str) -> list[int] | None:
-        if (puzzle := puzzle.strip()).startswith("#"):
-            return None
-        if len(puzzle := puzzle.strip()) not in cls.VALID_PUZZLE_SIZES:
-            raise ValueError(f"Puzzle has invalid length: {len(puzzle)}")
-        if not re.match(r"[\d|\.]*", puzzle):
-            raise ValueError(f"Puzzle does not match regex: {puzzle}")
-        return [int(x) if x != "." else 0 for x in puzzle]
+    with Timer() as loop_timer, open(args.output, "w", newline="") as fp:
+        chunks = DataLoader.load_stream_to_chunks(args.filepath, args.chunk_size)
+        results = solve_chunks(prefetch(chunks), solver_cls)
+        num_puzzles: int = write_results(log_progress(results), fp)
+    logger.info(f"Time for solving all puzzles: {loop_timer}s")
+    logger.info(f"Final profile result: {num_puzzles/loop_timer.interval} puzzles/s")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import argparse
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from pydoku.loader import DataLoader
+from pydoku.generator import SYMMETRIES, PuzzleGenerator, generate_many
+from benchmark_utils import Timer, logger  # type: ignore
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output", type=argparse.FileType("wb"), help="sudoku file")
+    parser.add_argument("--count", type=int, default=10000, help="number of puzzles")
+    parser.add_argument("--box-size", type=int, default=3, help="box edge length")
+    parser.add_argument("--clues", type=int, default=None, help="target clue count")
+    parser.add_argument("--symmetry", choices=SYMMETRIES, default="none")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args: argparse.Namespace = parser.parse_args()
+    generator = PuzzleGenerator(args.box_size, args.clues, args.symmetry)
+
+    def log_progress(chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        generated: int = 0
+        for chunk in chunks:
+            generated += len(chunk)
+            logger.info(f"Generated {generated:>9d} puzzles")
+            yield chunk
+
+    with Timer() as timer, args.output as fp:
+        chunks = generate_many(args.count, generator, args.seed, args.workers)
+        num_puzzles: int = DataLoader.write_text(fp, log_progress(chunks))
+    logger.info(f"Time for generating all puzzles: {timer}s")
+    logger.info(f"Final generation rate: {num_puzzles/timer.interval} puzzles/s")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from pydoku.loader import INVALID_CELL, cell_lookup
+from pydoku.geometry import cells_geometry
+from pydoku.solver.abc import Solver
+from pydoku.solver.batch import BatchSolver
+from pydoku.solver.exactcover import ExactCoverSolver
+
+
+class ServiceMetrics(NamedTuple):
+    queue_depth: int  # Requests waiting to be batched
+    max_queue_depth: int  # Highest queue depth observed since start
+    in_flight: int  # Batches currently running in the executor
+    requests: int  # Requests accepted since start
+    batches: int  # Batches dispatched since start
+    mean_batch_size: float
+    mean_wait: float  # Seconds between a request being queued and dispatched
+
+
+class _Request(NamedTuple):
+    cells: np.ndarray  # (cells,) uint8 puzzle
+    future: asyncio.Future
+    queued: float
+
+
+# One batch solver per executor thread or process, rebuilt if the fallback changes
+_local: threading.local = threading.local()
+
+
+def _solve_batch(
+    puzzles: np.ndarray, fallback: type[Solver] | None
+) -> tuple[np.ndarray, np.ndarray]:
+    solver: BatchSolver | None = getattr(_local, "solver", None)
+    if solver is None or solver.fallback is not fallback:
+        solver = _local.solver = BatchSolver(fallback)
+    return solver.solve_batch(puzzles)
+
+
+class SolverService:
+    """Asyncio front end that solves puzzles in micro-batches on an executor.
+
+    Requests wait in a bounded queue until `max_batch_size` of them are ready
+    or the oldest has waited `max_delay` seconds. Each batch is split by grid
+    size and run through `BatchSolver` on the executor, with at most
+    `max_concurrency` batches in flight. A thread pool is created when no
+    executor is given; a process pool works as well.
+    """
+
+    def __init__(
+        self,
+        fallback: type[Solver] | None = ExactCoverSolver,
+        max_batch_size: int = 256,
+        max_delay: float = 0.005,
+        max_concurrency: int = 4,
+        max_queue: int = 0,
+        executor: Executor | None = None,
+    ):
+        self.fallback: type[Solver] | None = fallback
+        self.max_batch_size: int = max_batch_size
+        self.max_delay: float = max_delay
+        self.max_concurrency: int = max_concurrency
+        self.max_queue: int = max_queue
+        self.executor: Executor | None = executor
+        self._owns_executor: bool = executor is None
+        self._queue: asyncio.Queue | None = None
+        self._collector: asyncio.Task | None = None
+        self._dispatches: set[asyncio.Task] = set()
+        self._slots: asyncio.Semaphore | None = None
+        self._max_queue_depth: int = 0
+        self._in_flight: int = 0
+        self._requests: int = 0
+        self._batches: int = 0
+        self._batched: int = 0
+        self._wait: float = 0.0
+
+    async def __aenter__(self) -> "SolverService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._collector is not None:
+            raise RuntimeError("Solver service is already running")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.max_concurrency)
+        self._queue = asyncio.Queue(self.max_queue)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._collector = asyncio.create_task(self._collect())
+
+    async def close(self) -> None:
+        """Finish every queued request, then release the executor if owned."""
+        if self._collector is None or self._queue is None:
+            return
+        await self._queue.put(None)
+        await self._collector
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches)
+        self._collector = None
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def solve(self, puzzle: str | bytes | np.ndarray) -> np.ndarray | None:
+        """Solve one puzzle, returning its `(cells,)` solution or None if unsolved."""
+        if self._queue is None or self._collector is None:
+            raise RuntimeError("Cannot invoke solve() before start().")
+        cells: np.ndarray = self._parse(puzzle)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Waits here when the queue is full, pushing back on the caller
+        await self._queue.put(_Request(cells, future, time.perf_counter()))
+        self._requests += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return await future
+
+    @property
+    def metrics(self) -> ServiceMetrics:
+        return ServiceMetrics(
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            max_queue_depth=self._max_queue_depth,
+            in_flight=self._in_flight,
+            requests=self._requests,
+            batches=self._batches,
+            mean_batch_size=self._batched / self._batches if self._batches else 0.0,
+            mean_wait=self._wait / self._batched if self._batched else 0.0,
+        )
+
+    @classmethod
+    def _parse(cls, puzzle: str | bytes | np.ndarray) -> np.ndarray:
+        if isinstance(puzzle, np.ndarray):
+            cells: np.ndarray = np.asarray(puzzle, dtype=np.uint8).reshape(-1)
+        else:
+            line: bytes = puzzle.encode() if isinstance(puzzle, str) else puzzle
+            cells = np.frombuffer(line.strip(), dtype=np.uint8)
+        grid_size: int = cells_geometry(cells.size).grid_size
+        if not isinstance(puzzle, np.ndarray):
+            cells = cell_lookup(grid_size)[cells]
+            if np.any(cells == INVALID_CELL):
+                raise ValueError(f"Puzzle has invalid cells: {puzzle!r}")
+        return cells
+
+    async def _collect(self) -> None:
+        # Gather requests until the batch is full or its oldest request is due
+        queue: asyncio.Queue = self._queue  # type: ignore[assignment]
+        closing: bool = False
+        while not closing:
+            first: _Request | None = await queue.get()
+            if first is None:
+                break
+            batch: list[_Request] = [first]
+            deadline: float = first.queued + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout: float = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    else:
+                        request = queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+            await self._slots.acquire()  # type: ignore[union-attr]
+            task: asyncio.Task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list[_Request]) -> None:
+        now: float = time.perf_counter()
+        self._batches += 1
+        self._batched += len(batch)
+        self._wait += sum(now - request.queued for request in batch)
+        self._in_flight += 1
+        try:
+            # Puzzles of different sizes cannot share one candidate tensor
+            groups: dict[int, list[_Request]] = {}
+            for request in batch:
+                groups.setdefault(request.cells.size, []).append(request)
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            for requests in groups.values():
+                puzzles: np.ndarray = np.stack([r.cells for r in requests])
+                try:
+                    solutions, solved = await loop.run_in_executor(
+                        self.executor, _solve_batch, puzzles, self.fallback
+                    )
+                except Exception as e:
+                    for request in requests:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+                    continue
+                # Callers that gave up have cancelled their futures already
+                for request, solution, ok in zip(requests, solutions, solved):
+                    if not request.future.done():
+                        request.future.set_result(solution if ok else None)
+        finally:
+            self._in_flight -= 1
+            self._slots.release()  # type: ignore[union-attr]
@@ -1,7 +1,34 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
-__all__: list[str] = ["Solver", "BackTrackingSolver"]
+__all__: list[str] = [
+    "Solver",
+    "BackTrackingSolver",
+    "ExactCoverSolver",
+    "StochasticSolver",
+    "PortfolioSolver",
+    "AutoSolver",
+    "Propagator",
+    "SolverStats",
+    "SolveResult",
+    "SolveStatus",
+    "CancellationToken",
+    "BatchSolver",
+    "solve_many",
+    "SOLVERS",
+    "get_solver",
+    "register_solver",
+]
 
+from pydoku.solver.propagation import Propagator
+from pydoku.solver.stats import SolverStats
+from pydoku.solver.budget import CancellationToken, SolveResult, SolveStatus
 from pydoku.solver.abc import Solver
 from pydoku.solver.backtracking import BackTrackingSolver
+from pydoku.solver.exactcover import ExactCoverSolver
+from pydoku.solver.stochastic import StochasticSolver
+from pydoku.solver.portfolio import PortfolioSolver
+from pydoku.solver.auto import AutoSolver
+from pydoku.solver.registry import SOLVERS, get_solver, register_solver
+from pydoku.solver.batch import BatchSolver
+from pydoku.solver.parallel import solve_many
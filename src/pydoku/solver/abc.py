@@ -1,30 +1,130 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
+import time
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from pydoku.sudoku import Sudoku
+from pydoku.loader import cell_lookup
+from pydoku.solver.propagation import Propagation, Propagator
+from pydoku.solver.stats import SolverStats, TraceHook
+from pydoku.solver.budget import Budget, CancellationToken, SolveResult, SolveStatus
 
 
 class Solver(ABC):
-    def __init__(self, sudoku: Sudoku):
+    def __init__(self, sudoku: Sudoku, propagator: Propagator | None = None):
         self.sudoku: Sudoku = sudoku
+        self.propagator: Propagator | None = propagator
+        self.propagation: Propagation | None = None
         self._setup: bool = False
+        # Search counters since the last setup() and durations of the last phases
+        self.num_nodes: int = 0
+        self.num_backtracks: int = 0
+        self.max_depth: int = 0
+        self.setup_time: float = 0.0
+        self.solve_time: float = 0.0
+        # Optional hook sampling every `trace_interval`-th search event
+        self.trace: TraceHook | None = None
+        self.trace_interval: int = 1
+        self._events: int = 0
+        # Limits of the current solve(), checked whenever nodes reach `_next_check`
+        self.budget: Budget = Budget()
+        self._next_check: int = self.budget.next_check
+        self._solve_start: float = 0.0
+
+    def reset(self, sudoku: Sudoku | np.ndarray) -> None:
+        """Rebind the solver to another puzzle, keeping buffers for reuse.
+
+        Arrays are wrapped without copying, so the solution is written into them.
+        """
+        if not isinstance(sudoku, Sudoku):
+            sudoku = Sudoku.from_array(sudoku)
+        self.sudoku = sudoku
+        self.propagation = None
+        self._setup = False
 
     @abstractmethod
     def setup(self, *args, **kwargs) -> bool:
         self._setup = True
+        self.num_nodes = 0
+        self.num_backtracks = 0
+        self.max_depth = 0
+        self.solve_time = 0.0
+        self._events = 0
         return True
 
     @abstractmethod
-    def solve(self, *args, **kwargs) -> bool:
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        """Search for a solution within an optional time, node and cancel budget."""
         if not self._setup:
             raise RuntimeError("Cannot invoke solve() before setup().")
-        return True
+        self._solve_start = time.perf_counter()
+        self._arm(Budget(timeout, max_nodes, cancel))
+        return self._result(SolveStatus.SOLVED)
+
+    def _arm(self, budget: Budget) -> None:
+        self.budget = budget
+        self._next_check = budget.next_check
+
+    def _result(self, status: SolveStatus | bool) -> SolveResult:
+        # Unsolved searches that ran to completion have proven the puzzle unsat
+        if isinstance(status, bool):
+            status = SolveStatus.SOLVED if status else SolveStatus.UNSAT
+        self.solve_time = time.perf_counter() - self._solve_start
+        return SolveResult(status, self.stats)
+
+    def _check_budget(self, nodes: int) -> None:
+        self.budget.check(nodes)
+        self._next_check = self.budget.next_check
+
+    @property
+    def stats(self) -> SolverStats:
+        """Counters and timings of the last setup() and search."""
+        propagation: Propagation | None = self.propagation
+        return SolverStats(
+            nodes=self.num_nodes,
+            backtracks=self.num_backtracks,
+            max_depth=self.max_depth,
+            fixed=propagation.fixed if propagation else 0,
+            eliminated=propagation.eliminated if propagation else 0,
+            setup_time=self.setup_time,
+            solve_time=self.solve_time,
+        )
+
+    def set_trace(self, trace: TraceHook | None, interval: int = 1) -> None:
+        """Install a search event hook sampled every `interval` events."""
+        if interval < 1:
+            raise ValueError(f"Trace interval must be positive: {interval}")
+        self.trace = trace
+        self.trace_interval = interval
+
+    def _emit(self, event: str, depth: int, nodes: int) -> None:
+        # Only reached when a hook is installed, so searches without one skip it
+        self._events += 1
+        if self._events % self.trace_interval == 0:
+            self.trace(event, depth, nodes)  # type: ignore[misc]
+
+    def propagate(self, candidates: np.ndarray | None = None) -> bool:
+        """Run the configured propagation stage, False if it finds a contradiction."""
+        if self.propagator is None:
+            return True
+        if candidates is None:
+            candidates = Propagator.candidates(self.sudoku)
+        self.propagation = self.propagator.propagate(self.sudoku, candidates)
+        return self.propagation.consistent
 
-    def check(self, solution: str | None = None) -> bool:
+    def check(self, solution: str | np.ndarray | None = None) -> bool:
         complete: bool = self.sudoku.is_complete()
-        if solution is None:
+        if solution is None or not complete:
             return complete
-        cells: str = "".join([str(x) for x in self.sudoku.cells.reshape(-1)])
-        return complete and cells == solution
+        if isinstance(solution, str):
+            lookup: np.ndarray = cell_lookup(self.sudoku.grid_size)
+            solution = lookup[np.frombuffer(solution.encode(), dtype=np.uint8)]
+        return bool(np.array_equal(self.sudoku.cells.reshape(-1), solution.reshape(-1)))
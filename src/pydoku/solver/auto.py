@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+from typing import Any
+
+from pydoku.sudoku import Sudoku
+from pydoku.solver.abc import Solver
+from pydoku.solver.stats import timed
+from pydoku.solver.budget import CancellationToken, SolveResult
+from pydoku.solver.propagation import Propagator
+from pydoku.solver.routing import ROUTING, PuzzleFeatures, extract_features, route
+
+
+class AutoSolver(Solver):
+    """Route each puzzle to the engine expected to be fastest on its class.
+
+    Cheap features from a single elimination pass pick the engine through a
+    table calibrated from benchmark runs, and the chosen name is kept as
+    `engine`. Puzzles the pass already refutes never reach an engine. Engine
+    instances are reused across reset() like any other solver buffers.
+    """
+
+    def __init__(
+        self,
+        sudoku: Sudoku,
+        routing: dict[str, Any] | None = None,
+        propagator: Propagator | None = None,
+    ):
+        super().__init__(sudoku, propagator)
+        self.routing: dict[str, Any] = routing or ROUTING
+        self.features: PuzzleFeatures | None = None
+        self.engine: str | None = None
+        self._engines: dict[str, Solver] = {}
+
+    @timed("setup")
+    def setup(self, *args, **kwargs) -> bool:
+        super().setup(*args, **kwargs)
+        self.features = extract_features(self.sudoku)
+        self.engine = None
+        if not self.features.consistent:
+            return False
+        self.engine = route(self.features, self.routing)
+        engine: Solver = self._delegate(self.engine)
+        engine.set_trace(self.trace, self.trace_interval)
+        engine.setup()
+        self.propagation = engine.propagation
+        return False
+
+    def _delegate(self, name: str) -> Solver:
+        if (engine := self._engines.get(name)) is not None:
+            engine.reset(self.sudoku)
+            return engine
+        # Imported here as the registry itself lists this solver
+        from pydoku.solver.registry import get_solver
+
+        engine = get_solver(name)(self.sudoku, propagator=self.propagator)
+        self._engines[name] = engine
+        return engine
+
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        super().solve(timeout, max_nodes, cancel)
+        if self.engine is None:
+            return self._result(False)
+        engine: Solver = self._engines[self.engine]
+        result: SolveResult = engine.solve(timeout, max_nodes, cancel)
+        self.num_nodes = engine.num_nodes
+        self.num_backtracks = engine.num_backtracks
+        self.max_depth = engine.max_depth
+        return self._result(result.status)
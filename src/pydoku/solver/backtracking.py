@@ -1,71 +1,252 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
+import functools
+
 import numpy as np
 
+from pydoku.sudoku import Sudoku
+from pydoku.geometry import Geometry
 from pydoku.solver.abc import Solver
+from pydoku.solver.propagation import Propagator
+from pydoku.solver.stats import timed
+from pydoku.solver.budget import BudgetExceeded, CancellationToken, SolveResult
+
+
+@functools.cache
+def _bit_weights(grid_size: int) -> np.ndarray:
+    """Bit weight of every value, turning candidate rows into integer masks."""
+    weights: np.ndarray = np.left_shift(1, np.arange(grid_size + 1, dtype=np.int64))
+    weights[0] = 0
+    weights.flags.writeable = False
+    return weights
 
 
 class BackTrackingSolver(Solver):
+    def __init__(
+        self,
+        sudoku: Sudoku,
+        dynamic_order: bool = False,
+        propagator: Propagator | None = None,
+    ):
+        super().__init__(sudoku, propagator)
+        # Pick the most-constrained open cell at every step on an explicit stack
+        self.dynamic_order: bool = dynamic_order
+        # Reused across reset() while the grid size stays the same
+        self.search_space: np.ndarray = np.empty((0, 0, 0), dtype=np.bool_)
+
+    @timed("setup")
     def setup(self, *args, **kwargs) -> bool:
         super().setup(*args, **kwargs)
-        self.search_space: np.ndarray = self._setup_search_space()
+        self._setup_search_space()
         self._reduce_search_space()
+        self.consistent: bool = (
+            self.propagate(self.search_space) and self.sudoku.is_valid()
+        )
         self.search_order: np.ndarray = self._setup_search_order()
+        self._setup_used_masks()
         return False
 
-    def solve(self, *args, **kwargs) -> bool:
-        super().solve(*args, **kwargs)
-        return self._backtrack(0)
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        super().solve(timeout, max_nodes, cancel)
+        if not self.consistent:
+            return self._result(False)
+        # Searches leave partial placements behind when their budget runs out
+        initial: np.ndarray | None = (
+            self.sudoku.cells.copy() if self.budget.limited else None
+        )
+        try:
+            if self.dynamic_order:
+                solved: bool = self._search_dynamic()
+            else:
+                solved = self._backtrack(0)
+        except BudgetExceeded as e:
+            # The node that tripped the budget was counted but never placed
+            self.num_nodes -= 1
+            if not self.dynamic_order:
+                # Placements still on the stack when stopped were never undone
+                self.num_backtracks = self.num_nodes - self._abort_depth
+            # Unit masks are left mid-search so another setup() is required
+            self.sudoku.cells[...] = initial
+            self._setup = False
+            return self._result(e.status)
+        finally:
+            # Search writes cells directly so recount the validity state once
+            self.sudoku.refresh()
+        if not self.dynamic_order:
+            # Every placement is undone unless it is part of the solution
+            path: int = len(self._order) if solved else 0
+            self.num_backtracks = self.num_nodes - path
+        return self._result(solved)
 
     def _setup_search_space(self) -> np.ndarray:
         shape: tuple[int, int, int] = (*self.sudoku.shape, self.sudoku.grid_size + 1)
-        search_space: np.ndarray = np.zeros(shape, dtype=np.bool_)
-        search_space[:, :, 1:] = 1
-        return search_space
+        if self.search_space.shape != shape:
+            self.search_space = np.empty(shape, dtype=np.bool_)
+        self.search_space[:, :, 0] = False
+        self.search_space[:, :, 1:] = True
+        return self.search_space
 
     def _setup_search_order(self, sort_by_size: bool = True) -> np.ndarray:
-        search_counts: np.ndarray = np.apply_along_axis(np.sum, 2, self.search_space)
-        search_idxs: np.ndarray = np.indices(search_counts.shape)
-        search_space: np.ndarray = np.stack([search_idxs[0], search_idxs[1]], axis=-1)
+        coords: np.ndarray = self.sudoku.geometry.coords
         if sort_by_size:
+            search_counts: np.ndarray = np.count_nonzero(self.search_space, axis=2)
             _sorted: np.ndarray = np.argsort(search_counts, axis=None, kind="mergesort")
-            return search_space.reshape((search_counts.size, 2))[_sorted]
-        return search_space.reshape((search_counts.size, 2))
+            return coords[_sorted]
+        return coords
 
     def _reduce_search_space(self) -> np.ndarray:
-        for idx in range(self.sudoku.grid_size):
-            row: np.ndarray = np.unique(self.sudoku.get_row_by_idx(idx))
-            col: np.ndarray = np.unique(self.sudoku.get_col_by_idx(idx))
-            box: np.ndarray = np.unique(self.sudoku.get_box_by_num(idx).reshape(-1))
-            d: int = self.sudoku.box_size
-            i: int = idx // d * d
-            j: int = idx % d * d
-            self.search_space[idx, :, row] = False
-            self.search_space[:, idx, col] = False
-            self.search_space[i : i + d, j : j + d, box] = False
-
+        # Values already placed in a unit, read from the sudoku's unit counts
+        grid: Geometry = self.sudoku.geometry
+        used: np.ndarray = (
+            (self.sudoku.row_counts > 0)[grid.rows]
+            | (self.sudoku.col_counts > 0)[grid.cols]
+            | (self.sudoku.box_counts > 0)[grid.boxes]
+        )
+        self.search_space &= ~used.reshape(self.search_space.shape)
         return self.search_space
 
+    def _setup_used_masks(self) -> None:
+        # Bit `v` of each unit mask is set when digit `v` is already placed in the unit
+        n: int = self.sudoku.grid_size
+        grid: Geometry = self.sudoku.geometry
+        weights: np.ndarray = _bit_weights(n)
+        self.row_masks: list[int] = ((self.sudoku.row_counts > 0) @ weights).tolist()
+        self.col_masks: list[int] = ((self.sudoku.col_counts > 0) @ weights).tolist()
+        self.box_masks: list[int] = ((self.sudoku.box_counts > 0) @ weights).tolist()
+        # Native copies of the open cells in search order so the hot loop avoids
+        # numpy scalars, each with its unit indices and candidate mask
+        cells: np.ndarray = self.search_order[:, 0] * n + self.search_order[:, 1]
+        cells = cells[self.sudoku.cells.reshape(-1)[cells] == 0]
+        masks: np.ndarray = self.search_space.reshape(n * n, -1)[cells] @ weights
+        self._order: list[tuple[int, int, int, int]] = list(
+            zip(
+                grid.rows[cells].tolist(),
+                grid.cols[cells].tolist(),
+                grid.boxes[cells].tolist(),
+                masks.tolist(),
+            )
+        )
+
     def _backtrack(self, idx: int = 0) -> bool:
-        # Base condition reaching beyond sudoku cell space
-        if idx == self.sudoku.cells.size:
+        # Base condition reaching beyond the open cells (frozen cells are pre-skipped)
+        if idx == len(self._order):
+            self.max_depth = idx
             return True
-        # Pull search indicies for current cell
-        row: int = self.search_order[idx][0]
-        col: int = self.search_order[idx][1]
-        # Skip cells that are frozen without changing the value
-        if self.sudoku.cells_frozen[row, col] != 0:
-            return self._backtrack(idx + 1)
-        # Iterate over cell index search space
-        for (v,), valid_value_update in np.ndenumerate(self.search_space[row, col]):
-            # Only update cell with values in search space
-            if valid_value_update:
-                self.sudoku.cells[row, col] = v
-                # Recurse to next cell if update is valid
-                if self.sudoku.cell_is_valid(row, col):
-                    if self._backtrack(idx + 1):
-                        return True
+        # Pull search indicies and unit masks for current cell
+        row, col, box, mask = self._order[idx]
+        used: int = self.row_masks[row] | self.col_masks[col] | self.box_masks[box]
+        # Iterate over cell search space values not yet used in its row, column or box
+        free: int = mask & ~used
+        if not free and idx > self.max_depth:
+            self.max_depth = idx
+        while free:
+            bit: int = free & -free
+            free ^= bit
+            self.num_nodes += 1
+            if self.num_nodes >= self._next_check:
+                self._abort_depth: int = idx
+                self._check_budget(self.num_nodes)
+            if self.trace is not None:
+                self._emit("place", idx, self.num_nodes)
+            self.sudoku.cells[row, col] = bit.bit_length() - 1
+            self.row_masks[row] |= bit
+            self.col_masks[col] |= bit
+            self.box_masks[box] |= bit
+            if self._backtrack(idx + 1):
+                return True
+            self.row_masks[row] ^= bit
+            self.col_masks[col] ^= bit
+            self.box_masks[box] ^= bit
+            if self.trace is not None:
+                self._emit("backtrack", idx, self.num_nodes)
         # Recurse backwards if cell is incomplete
         self.sudoku.cells[row, col] = 0
         return False
+
+    def _search_dynamic(self) -> bool:
+        cells: np.ndarray = self.sudoku.cells
+        row_masks, col_masks, box_masks = self.row_masks, self.col_masks, self.box_masks
+        # Open cells before `depth` are assigned, those from `depth` onwards are not
+        order: list[tuple[int, int, int, int]] = list(self._order)
+        num_open: int = len(order)
+        # Explicit undo stack of remaining candidate masks and the placed bit per depth
+        remaining: list[int] = []
+        placed: list[int] = []
+        depth: int = 0
+        nodes: int = 0
+        backtracks: int = 0
+        deepest: int = 0
+        trace: bool = self.trace is not None
+        # Local node count at which the budget is next checked
+        check: int = self._next_check - self.num_nodes
+        while depth < num_open:
+            if len(remaining) == depth:
+                # Select the open cell with the fewest candidates (MRV)
+                best: int = depth
+                best_mask: int = 0
+                best_count: int = self.sudoku.grid_size + 1
+                for k in range(depth, num_open):
+                    row, col, box, mask = order[k]
+                    mask &= ~(row_masks[row] | col_masks[col] | box_masks[box])
+                    count: int = mask.bit_count()
+                    if count < best_count:
+                        best, best_mask, best_count = k, mask, count
+                        if count <= 1:
+                            break
+                order[depth], order[best] = order[best], order[depth]
+                remaining.append(best_mask)
+                placed.append(0)
+            row, col, box, _ = order[depth]
+            mask = remaining[depth]
+            if mask == 0:
+                # Exhausted cell so unwind one level and undo its placement
+                if depth > deepest:
+                    deepest = depth
+                remaining.pop()
+                placed.pop()
+                cells[row, col] = 0
+                depth -= 1
+                if depth < 0:
+                    self._record(nodes, backtracks, deepest)
+                    return False
+                backtracks += 1
+                if trace:
+                    self._emit("backtrack", depth, self.num_nodes + nodes)
+                row, col, box, _ = order[depth]
+                bit: int = placed[depth]
+                row_masks[row] ^= bit
+                col_masks[col] ^= bit
+                box_masks[box] ^= bit
+                continue
+            # Place the lowest remaining candidate and descend
+            bit = mask & -mask
+            remaining[depth] = mask ^ bit
+            placed[depth] = bit
+            nodes += 1
+            if nodes >= check:
+                try:
+                    self._check_budget(self.num_nodes + nodes)
+                except BudgetExceeded:
+                    self._record(nodes, backtracks, deepest)
+                    raise
+                check = self._next_check - self.num_nodes
+            if trace:
+                self._emit("place", depth, self.num_nodes + nodes)
+            cells[row, col] = bit.bit_length() - 1
+            row_masks[row] |= bit
+            col_masks[col] |= bit
+            box_masks[box] |= bit
+            depth += 1
+        self._record(nodes, backtracks, num_open)
+        return True
+
+    def _record(self, nodes: int, backtracks: int, depth: int) -> None:
+        self.num_nodes += nodes
+        self.num_backtracks += backtracks
+        self.max_depth = max(self.max_depth, depth)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.geometry import cells_geometry, geometry
+from pydoku.validation import unit_counts, validate_many
+from pydoku.solver.abc import Solver
+from pydoku.solver.exactcover import ExactCoverSolver
+
+
+class BatchSolver:
+    """Solve `(N, cells)` uint8 puzzle batches with whole-array singles detection.
+
+    Candidates for a chunk of puzzles live in one `(N, n, n, n)` boolean tensor,
+    so elimination, naked singles and hidden singles run as a handful of numpy
+    operations per sweep across every puzzle at once. Puzzles that stall are
+    handed to a scalar `Solver` one at a time.
+    """
+
+    def __init__(
+        self,
+        fallback: type[Solver] | None = ExactCoverSolver,
+        chunk_size: int = 16384,
+        max_sweeps: int = 128,
+    ):
+        self.fallback: type[Solver] | None = fallback
+        self.chunk_size: int = chunk_size
+        self.max_sweeps: int = max_sweeps
+        self.num_propagated: int = 0  # Puzzles closed by the vectorized sweeps
+        self.num_searched: int = 0  # Puzzles handed to the fallback solver
+        self._solver: Solver | None = None
+
+    def solve_batch(self, puzzles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return solved `(N, cells)` grids and an `(N,)` mask of solved puzzles."""
+        puzzles = np.atleast_2d(np.asarray(puzzles, dtype=np.uint8))
+        grid_size: int = cells_geometry(puzzles.shape[1]).grid_size
+        solutions: np.ndarray = puzzles.copy()
+        solved: np.ndarray = np.zeros(puzzles.shape[0], dtype=np.bool_)
+        for start in range(0, puzzles.shape[0], self.chunk_size):
+            stop: int = start + self.chunk_size
+            grids: np.ndarray = solutions[start:stop].reshape(-1, grid_size, grid_size)
+            solved[start:stop] = self._solve_chunk(grids)
+        return solutions, solved
+
+    def _solve_chunk(self, grids: np.ndarray) -> np.ndarray:
+        solved: np.ndarray = np.zeros(grids.shape[0], dtype=np.bool_)
+        failed: np.ndarray = np.zeros(grids.shape[0], dtype=np.bool_)
+        active: np.ndarray = np.arange(grids.shape[0])
+        for _ in range(self.max_sweeps):
+            if active.size == 0:
+                break
+            sub: np.ndarray = grids[active]
+            progress, contradiction = self._sweep(sub)
+            grids[active] = sub
+            complete: np.ndarray = ~contradiction & ~np.any(sub == 0, axis=(1, 2))
+            # Singles placed in the same sweep may clash so recheck finished grids
+            contradiction[complete] = ~validate_many(sub[complete])
+            complete &= ~contradiction
+            solved[active[complete]] = True
+            failed[active[contradiction]] = True
+            # Stalled puzzles drop out of the sweep and are left to the fallback
+            active = active[progress & ~complete & ~contradiction]
+        self.num_propagated += int(np.count_nonzero(solved))
+        if self.fallback is not None:
+            for i in np.flatnonzero(~solved & ~failed):
+                self.num_searched += 1
+                solved[i] = self._search(grids[i])
+        return solved
+
+    def _search(self, grid: np.ndarray) -> bool:
+        # The sudoku wraps the grid so the fallback solves it in place, and one
+        # fallback instance is reset between puzzles to keep its buffers
+        if self._solver is None:
+            self._solver = self.fallback(Sudoku.from_array(grid))  # type: ignore[misc]
+        else:
+            self._solver.reset(grid)
+        self._solver.setup()
+        return bool(self._solver.solve())
+
+    @classmethod
+    def _sweep(cls, grids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Place all naked and hidden singles once, returning progress/contradiction."""
+        num, n, _ = grids.shape
+        d: int = geometry(n).box_size
+        empty: np.ndarray = grids == 0
+
+        # Digits per unit, a count above one is a contradiction in the grid
+        units: tuple[np.ndarray, ...] = unit_counts(grids)
+        stacked: np.ndarray = np.concatenate(units, axis=1)
+        contradiction: np.ndarray = np.any(stacked[:, :, 1:] > 1, axis=(1, 2))
+        rows: np.ndarray = units[0][:, :, 1:]
+        cols: np.ndarray = units[1][:, :, 1:]
+        boxes: np.ndarray = units[2][:, :, 1:].reshape(num, d, d, n)
+
+        # Candidates are the digits unused by the row, column and box of each cell
+        used: np.ndarray = (rows[:, :, None, :] > 0) | (cols[:, None, :, :] > 0)
+        used_boxes: np.ndarray = used.reshape(num, d, d, d, d, n)
+        used_boxes |= boxes[:, :, None, :, None, :] > 0
+        candidates: np.ndarray = ~used & empty[..., None]
+        counts: np.ndarray = candidates.sum(axis=-1, dtype=np.uint8)
+        contradiction |= np.any(empty & (counts == 0), axis=(1, 2))
+
+        # Hidden singles per unit, combined with naked singles per cell
+        single: np.ndarray = (candidates.sum(axis=2, keepdims=True) == 1) | (
+            candidates.sum(axis=1, keepdims=True) == 1
+        )
+        single_boxes: np.ndarray = single.reshape(num, d, d, d, d, n)
+        single_boxes |= (
+            candidates.reshape(num, d, d, d, d, n).sum(axis=(2, 4), keepdims=True) == 1
+        )
+        single &= candidates
+        single |= candidates & (counts == 1)[..., None]
+        # A cell forced to two different digits cannot be completed
+        contradiction |= np.any(single.sum(axis=-1) > 1, axis=(1, 2))
+        fixed: np.ndarray = single.any(axis=-1)
+        grids[fixed] = np.argmax(single[fixed], axis=-1).astype(grids.dtype) + 1
+        return fixed.any(axis=(1, 2)), contradiction
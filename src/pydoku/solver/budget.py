@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import sys
+import enum
+import time
+import threading
+from typing import NamedTuple
+
+from pydoku.solver.stats import SolverStats
+
+
+class SolveStatus(enum.Enum):
+    SOLVED = "solved"
+    UNSAT = "unsat"  # The search space was exhausted without a solution
+    BUDGET_EXCEEDED = "budget_exceeded"  # Timeout or node limit reached first
+    CANCELLED = "cancelled"  # Stopped through a cancellation token
+
+
+class SolveResult(NamedTuple):
+    """Outcome of `Solver.solve()`, truthy only when the sudoku was solved."""
+
+    status: SolveStatus
+    stats: SolverStats
+
+    def __bool__(self) -> bool:
+        return self.status is SolveStatus.SOLVED
+
+    @property
+    def solved(self) -> bool:
+        return self.status is SolveStatus.SOLVED
+
+
+class CancellationToken:
+    """Thread-safe flag a caller sets to stop searches that were given it."""
+
+    def __init__(self):
+        self._event: threading.Event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a search to unwind it once its budget runs out."""
+
+    def __init__(self, status: SolveStatus):
+        super().__init__(status.value)
+        self.status: SolveStatus = status
+
+
+class Budget:
+    """Time, node and cancellation limits of a single solve() call.
+
+    Searches compare their node count against `next_check` and only call
+    `check` when it is reached, so the clock and token are read once every
+    `CHECK_INTERVAL` nodes and an unlimited budget is never checked at all.
+    """
+
+    CHECK_INTERVAL: int = 1024
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ):
+        self.deadline: float | None = (
+            None if timeout is None else time.perf_counter() + timeout
+        )
+        self.max_nodes: int | None = max_nodes
+        self.cancel: CancellationToken | None = cancel
+        self.limited: bool = any(
+            limit is not None for limit in (timeout, max_nodes, cancel)
+        )
+        self.next_check: int = self._next_check(0)
+
+    def _next_check(self, nodes: int) -> int:
+        if not self.limited:
+            return sys.maxsize
+        step: int = nodes + self.CHECK_INTERVAL
+        return step if self.max_nodes is None else min(step, self.max_nodes + 1)
+
+    def check(self, nodes: int) -> None:
+        """Raise `BudgetExceeded` if a limit is hit, else schedule the next check."""
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise BudgetExceeded(SolveStatus.BUDGET_EXCEEDED)
+        if self.cancel is not None and self.cancel.cancelled:
+            raise BudgetExceeded(SolveStatus.CANCELLED)
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise BudgetExceeded(SolveStatus.BUDGET_EXCEEDED)
+        self.next_check = self._next_check(nodes)
@@ -1,154 +1,354 @@
-# #!/usr/bin/env python3
-# # -*- coding:utf-8 -*-
-
-# from sudoku.solver.abc import Solver
-
-# import itertools
-# from enum import Enum, unique
-# from typing import Tuple, TypeAlias
-
-
-# @unique
-# class _Constraint(int, Enum):
-#     POS = 0
-#     ROW = 1
-#     COL = 2
-#     BOX = 3
-
-
-# ConstraintIdx: TypeAlias = Tuple[int, int]
-# ConstraintMap: TypeAlias = Tuple[_Constraint, ConstraintIdx]
-# GridSelection: TypeAlias = Tuple[int, int, int]
-
-
-# class ExactCoverSolver(Solver):
-#     def solve(self) -> bool:
-#         return False
-
-
-# # SETUP CONSTRAINTS AND SELECTIONS
-# box_size: int = 3
-# grd_size: int = 9
-# arr_size: int = 81
-
-# size: int = grd_size
-
-# _idxs: list[int] = list(range(grd_size))
-# _vals: list[int] = list(range(1, grd_size + 1))
-# pos_cnst: list[tuple] = [(0, x) for x in itertools.product(_idxs, _idxs)]
-# row_cnst: list[tuple] = [(1, x) for x in itertools.product(_idxs, _vals)]
-# col_cnst: list[tuple] = [(2, x) for x in itertools.product(_idxs, _vals)]
-# box_cnst: list[tuple] = [(3, x) for x in itertools.product(_idxs, _vals)]
-# cnsts: list[tuple] = pos_cnst + row_cnst + col_cnst + box_cnst
-# sltns: dict[tuple, list[tuple]] = {}
-
-# for row, col, val in itertools.product(_idxs, _idxs, _vals):
-#     box: int = (row // box_size) * box_size + (col // box_size)
-#     sltns[(row, col, val)] = [
-#         (0, (row, col)),
-#         (1, (row, val)),
-#         (2, (col, val)),
-#         (3, (box, val)),
-#     ]
-
-# sets: dict[tuple, set[tuple]] = {j: set() for j in cnsts}
-# for sltn, cnst in sltns.items():
-#     for c in cnst:
-#         sets[c].add(sltn)
-
-
-# # @classmethod
-# # def _setup_constraints_and_selections(cls, x_size: int, y_size: int) -> Tuple:
-# #     constraints: List[ConstraintMap] = (
-# #         [(_Constraint.POS, x) for x in product(range(size), range(size))]
-# #         + [(_Constraint.ROW, x) for x in product(range(size), range(1, size + 1))]
-# #         + [(_Constraint.COL, x) for x in product(range(size), range(1, size + 1))]
-# #         + [(_Constraint.BOX, x) for x in product(range(size), range(1, size + 1))]
-# #     )
-# #     selections: Dict[GridSelection, List[ConstraintMap]] = {}
-# #     for row, col, number in product(range(size), range(size), range(1, size + 1)):
-# #         box: int = (row // x_size) * x_size + (col // y_size)
-# #         selections[(row, col, number)] = [
-# #             (_Constraint.POS, (row, col)),
-# #             (_Constraint.ROW, (row, number)),
-# #             (_Constraint.COL, (col, number)),
-# #             (_Constraint.BOX, (box, number)),
-# #         ]
-# #     return constraints, selections
-
-
-# #     @classmethod
-# #     def _setup_constraints_mapping(
-# #         cls,
-# #         constraints: List[ConstraintMap],
-# #         selections: Dict[GridSelection, List[ConstraintMap]],
-# #     ) -> Dict[ConstraintMap, Set[GridSelection]]:
-# #         sets: Dict[ConstraintMap, Set[GridSelection]] = {j: set() for j in constraints}
-# #         for grid_selection, constraint_maps in selections.items():
-# #             for constraint_map in constraint_maps:
-# #                 sets[constraint_map].add(grid_selection)
-# #         return sets
-
-# #     @classmethod
-# #     def _reduce_constraints(
-# #         cls,
-# #         constraints_map: Dict[ConstraintMap, Set[GridSelection]],
-# #         selections: Dict[GridSelection, List[ConstraintMap]],
-# #         index: GridSelection,
-# #     ) -> List[Set[GridSelection]]:
-# #         selected_contraints: List[Set[GridSelection]] = []
-# #         for constraint in selections[index]:
-# #             for selection in constraints_map[constraint]:
-# #                 for selection_constraint in selections[selection]:
-# #                     if selection_constraint != constraint:
-# #                         constraints_map[selection_constraint].remove(selection)
-# #             selected_contraints.append(constraints_map.pop(constraint))
-# #         return selected_contraints
-
-# #     @classmethod
-# #     def _restore_constraints(
-# #         cls,
-# #         constraints_map: Dict[ConstraintMap, Set[GridSelection]],
-# #         selections: Dict[GridSelection, List[ConstraintMap]],
-# #         index: GridSelection,
-# #         selected_contraints: List[Set[GridSelection]],
-# #     ) -> None:
-# #         for constraints in reversed(selections[index]):
-# #             constraints_map[constraints] = selected_contraints.pop()
-# #             for selection in constraints_map[constraints]:
-# #                 for selection_iter in selections[selection]:
-# #                     if selection_iter != constraints:
-# #                         constraints_map[selection_iter].add(selection)
-
-# #     @classmethod
-# #     def _generate_solutions(
-# #         cls,
-# #         constraints_map: Dict[ConstraintMap, Set[GridSelection]],
-# #         selections: Dict[GridSelection, List[ConstraintMap]],
-# #         grids: List[GridSelection] = [],
-# #     ):
-# #         if not constraints_map:
-# #             yield list(grids)
-# #         else:
-# #             constraint = min(constraints_map, key=lambda c: len(constraints_map[c]))
-# #             for index in list(constraints_map[constraint]):
-# #                 grids.append(index)
-# #                 subsets = cls._reduce_constraints(constraints_map, selections, index)
-# #                 for grid in cls._generate_solutions(constraints_map, selections, grids):
-# #                     yield grid
-# #                 cls._restore_constraints(constraints_map, selections, index, subsets)
-# #                 grids.pop()
-
-# #     @classmethod
-# #     def solve(cls, grid: Grid, x_size: int = 3, y_size: int = 3):
-# #         constraints, selections = cls._setup_constraints_and_selections(x_size, y_size)
-# #         constraints_map = cls._setup_constraints_mapping(constraints, selections)
-
-# #         for (row, col), value in np.ndenumerate(grid.values):
-# #             if value != 0:
-# #                 cls._reduce_constraints(constraints_map, selections, (row, col, value))
-
-# #         for solution_index in cls._generate_solutions(constraints_map, selections, []):
-# #             for row, col, value in solution_index:
-# #                 grid.values[row, col] = value
-# #             break
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import contextlib
+import functools
+import itertools
+from array import array
+from typing import Generator, NamedTuple
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.geometry import Geometry, geometry
+from pydoku.solver.abc import Solver
+from pydoku.solver.propagation import Propagator
+from pydoku.solver.stats import timed
+from pydoku.solver.budget import (
+    Budget,
+    BudgetExceeded,
+    CancellationToken,
+    SolveResult,
+)
+
+# Number of constraint columns each selection row satisfies (cell, row, col, box)
+NUM_CONSTRAINTS: int = 4
+
+
+class DancingLinks(NamedTuple):
+    """Pristine toroidal links for the sudoku exact cover matrix of a grid size.
+
+    Node 0 is the root header, nodes 1..C are the column headers and every
+    selection `(row, col, value)` owns four consecutive nodes after that.
+    """
+
+    left: np.ndarray
+    right: np.ndarray
+    up: np.ndarray
+    down: np.ndarray
+    column: np.ndarray
+    size: np.ndarray
+    num_columns: int
+
+
+@functools.cache
+def build_links(grid_size: int) -> DancingLinks:
+    """Build the pristine exact cover links for a grid size (cached)."""
+    n: int = grid_size
+    grid: Geometry = geometry(n)
+    num_columns: int = NUM_CONSTRAINTS * n * n
+    num_rows: int = n * n * n
+    num_nodes: int = 1 + num_columns + NUM_CONSTRAINTS * num_rows
+
+    # Constraint columns covered by every selection, ordered by selection index
+    cells, vals = np.divmod(np.arange(num_rows), n)
+    rows: np.ndarray = grid.rows[cells]
+    cols: np.ndarray = grid.cols[cells]
+    boxes: np.ndarray = grid.boxes[cells]
+    row_columns: np.ndarray = 1 + np.stack(
+        [
+            rows * n + cols,
+            n * n + rows * n + vals,
+            2 * n * n + cols * n + vals,
+            3 * n * n + boxes * n + vals,
+        ],
+        axis=-1,
+    )
+
+    nodes: np.ndarray = np.arange(num_nodes, dtype=np.int64)
+    column: np.ndarray = np.zeros(num_nodes, dtype=np.int64)
+    column[1 : num_columns + 1] = nodes[1 : num_columns + 1]
+    column[num_columns + 1 :] = row_columns.reshape(-1)
+
+    # Horizontal links cycle through headers and through each selection's nodes
+    left: np.ndarray = nodes - 1
+    right: np.ndarray = nodes + 1
+    left[0], right[num_columns] = num_columns, 0
+    row_nodes: np.ndarray = nodes[num_columns + 1 :].reshape(num_rows, NUM_CONSTRAINTS)
+    left[row_nodes] = np.roll(row_nodes, 1, axis=1)
+    right[row_nodes] = np.roll(row_nodes, -1, axis=1)
+
+    # Vertical links cycle through each column header and its nodes in order
+    up: np.ndarray = nodes.copy()
+    down: np.ndarray = nodes.copy()
+    members: np.ndarray = np.argsort(column[num_columns + 1 :], kind="stable")
+    members += num_columns + 1
+    size: np.ndarray = np.zeros(num_columns + 1, dtype=np.int64)
+    size[1:] = num_rows * NUM_CONSTRAINTS // num_columns
+    chains: np.ndarray = np.concatenate(
+        [nodes[1 : num_columns + 1, None], members.reshape(num_columns, -1)], axis=1
+    )
+    up[chains] = np.roll(chains, 1, axis=1)
+    down[chains] = np.roll(chains, -1, axis=1)
+
+    links: DancingLinks = DancingLinks(
+        left, right, up, down, column, size, num_columns=num_columns
+    )
+    for table in links[:-1]:
+        table.flags.writeable = False
+    return links
+
+
+class ExactCoverSolver(Solver):
+    def __init__(self, sudoku: Sudoku, propagator: Propagator | None = None):
+        super().__init__(sudoku, propagator)
+        # Working links, reused across reset() while the grid size stays the same
+        self.grid_size: int = 0
+        self.left: array = array("q")
+        self.right: array = array("q")
+        self.up: array = array("q")
+        self.down: array = array("q")
+        self.size: array = array("q")
+        self.column: array = array("q")
+
+    @timed("setup")
+    def setup(self, *args, **kwargs) -> bool:
+        super().setup(*args, **kwargs)
+        links: DancingLinks = build_links(self.sudoku.grid_size)
+        if self.grid_size != self.sudoku.grid_size:
+            self.grid_size = self.sudoku.grid_size
+            for name in ("left", "right", "up", "down", "size", "column"):
+                setattr(self, name, array("q", getattr(links, name).tobytes()))
+        self.num_columns: int = links.num_columns
+        self.consistent: bool = (
+            self.propagate() and self.sudoku.is_valid() and self._link_open(links)
+        )
+        return False
+
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        super().solve(timeout, max_nodes, cancel)
+        if not self.consistent:
+            return self._result(False)
+        # Cells are only written once a cover is complete, so nothing to restore
+        try:
+            with contextlib.closing(self._solutions()) as solutions:
+                chosen: list[int] | None = next(solutions, None)
+                if chosen is None:
+                    return self._result(False)
+                self._write(chosen, self.sudoku.cells)
+        except BudgetExceeded as e:
+            return self._result(e.status)
+        self.sudoku.refresh()
+        return self._result(True)
+
+    def _row_selection(self, node: int) -> tuple[int, int, int]:
+        n: int = self.sudoku.grid_size
+        cell, value = divmod((node - self.num_columns - 1) // NUM_CONSTRAINTS, n)
+        return cell // n, cell % n, value + 1
+
+    def _link_open(self, links: DancingLinks) -> bool:
+        """Link only the open constraints and the selections still possible.
+
+        This leaves the buffers exactly as covering every given would, but is
+        built with a few whole-array operations written through numpy views.
+        """
+        grid: Geometry = self.sudoku.geometry
+        left, right, up, down, size = (
+            np.frombuffer(buffer, dtype=np.int64)
+            for buffer in (self.left, self.right, self.up, self.down, self.size)
+        )
+        rows: np.ndarray = self.sudoku.row_counts[:, 1:] > 0
+        cols: np.ndarray = self.sudoku.col_counts[:, 1:] > 0
+        boxes: np.ndarray = self.sudoku.box_counts[:, 1:] > 0
+        # Constraints left to satisfy: empty cells and values missing from units
+        headers: np.ndarray = 1 + np.flatnonzero(
+            np.concatenate(
+                [self.sudoku.cells.reshape(-1) == 0, ~rows, ~cols, ~boxes], axis=None
+            )
+        )
+        ring: np.ndarray = np.concatenate([[0], headers])
+        right[ring] = np.roll(ring, -1)
+        left[ring] = np.roll(ring, 1)
+        up[headers] = headers
+        down[headers] = headers
+        size[:] = 0
+        # Selections of values not yet used by the row, column or box of empty cells
+        open_cells: np.ndarray = (self.sudoku.cells == 0).reshape(-1, 1)
+        used: np.ndarray = rows[grid.rows] | cols[grid.cols] | boxes[grid.boxes]
+        selections: np.ndarray = np.flatnonzero(open_cells & ~used)
+        if selections.size == 0:
+            return headers.size == 0
+        # Row nodes keep their pristine horizontal links
+        nodes: np.ndarray = (
+            self.num_columns + 1 + NUM_CONSTRAINTS * selections[:, None]
+        ) + np.arange(NUM_CONSTRAINTS)
+        nodes = nodes.reshape(-1)
+        left[nodes] = links.left[nodes]
+        right[nodes] = links.right[nodes]
+        # Vertical links chain the selected nodes of each column in node order
+        columns: np.ndarray = links.column[nodes]
+        order: np.ndarray = np.argsort(columns, kind="stable")
+        nodes, columns = nodes[order], columns[order]
+        same: np.ndarray = columns[1:] == columns[:-1]
+        down[nodes[:-1]] = np.where(same, nodes[1:], columns[:-1])
+        up[nodes[1:]] = np.where(same, nodes[:-1], columns[1:])
+        down[nodes[-1]], up[nodes[0]] = columns[-1], columns[0]
+        first: np.ndarray = np.concatenate([[True], ~same])
+        last: np.ndarray = np.concatenate([~same, [True]])
+        down[columns[first]] = nodes[first]
+        up[columns[last]] = nodes[last]
+        size += np.bincount(columns, minlength=size.size)
+        return True
+
+    def _cover(self, c: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i: int = down[c]
+        while i != c:
+            j: int = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        i: int = up[c]
+        while i != c:
+            j: int = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def _select_column(self) -> int:
+        right, size = self.right, self.size
+        best: int = right[0]
+        c: int = right[best]
+        while c != 0 and size[best] > 1:
+            if size[c] < size[best]:
+                best = c
+            c = right[c]
+        return best
+
+    def _solutions(self) -> Generator[list[int], None, None]:
+        """Yield the stack of chosen selection nodes at every complete cover.
+
+        Links are restored when the search is exhausted or closed early, so the
+        solver can search again without another setup().
+        """
+        right, left, down, column = self.right, self.left, self.down, self.column
+        # Explicit stack of the selection node currently chosen at each depth
+        chosen: list[int] = []
+        c: int = 0
+        node: int = 0
+        nodes: int = 0
+        backtracks: int = 0
+        deepest: int = 0
+        trace: bool = self.trace is not None
+        # Local node count at which the budget is next checked
+        check: int = self._next_check - self.num_nodes
+        forward: bool = True
+        try:
+            while True:
+                if forward:
+                    if right[0] == 0:
+                        deepest = max(deepest, len(chosen))
+                        yield chosen
+                        forward = False
+                        continue
+                    c = self._select_column()
+                    self._cover(c)
+                    node = down[c]
+                else:
+                    if not chosen:
+                        return
+                    # Undo the last selection and move on to the next row in its column
+                    backtracks += 1
+                    if trace:
+                        self._emit("backtrack", len(chosen) - 1, self.num_nodes + nodes)
+                    node = chosen.pop()
+                    c = column[node]
+                    j: int = left[node]
+                    while j != node:
+                        self._uncover(column[j])
+                        j = left[j]
+                    node = down[node]
+                if node == c:
+                    # Column exhausted so release it and keep unwinding
+                    if len(chosen) > deepest:
+                        deepest = len(chosen)
+                    self._uncover(c)
+                    forward = False
+                    continue
+                chosen.append(node)
+                j = right[node]
+                while j != node:
+                    self._cover(column[j])
+                    j = right[j]
+                forward = True
+                # Only raised once the row is fully covered, so the unwind below
+                # releases exactly the columns that were covered
+                nodes += 1
+                if nodes >= check:
+                    self._check_budget(self.num_nodes + nodes)
+                    check = self._next_check - self.num_nodes
+                if trace:
+                    self._emit("place", len(chosen) - 1, self.num_nodes + nodes)
+        finally:
+            self.num_nodes += nodes
+            self.num_backtracks += backtracks
+            self.max_depth = max(self.max_depth, deepest)
+            # Unwind the selections still on the stack when stopped early
+            while chosen:
+                node = chosen.pop()
+                j = left[node]
+                while j != node:
+                    self._uncover(column[j])
+                    j = left[j]
+                self._uncover(column[node])
+
+    def _write(self, chosen: list[int], cells: np.ndarray) -> np.ndarray:
+        for node in chosen:
+            row, col, v = self._row_selection(node)
+            cells[row, col] = v
+        return cells
+
+    def iter_solutions(self) -> Generator[np.ndarray, None, None]:
+        """Lazily yield every solution as an `(n, n)` grid, leaving the sudoku as is."""
+        if not self._setup:
+            raise RuntimeError("Cannot invoke iter_solutions() before setup().")
+        self._arm(Budget())
+        if not self.consistent:
+            return
+        with contextlib.closing(self._solutions()) as solutions:
+            for chosen in solutions:
+                yield self._write(chosen, self.sudoku.cells.copy())
+
+    def count_solutions(self, limit: int | None = None) -> int:
+        """Count solutions, stopping as soon as `limit` of them have been found."""
+        if not self._setup:
+            raise RuntimeError("Cannot invoke count_solutions() before setup().")
+        self._arm(Budget())
+        if not self.consistent:
+            return 0
+        # Count covers directly without materialising the grids
+        with contextlib.closing(self._solutions()) as solutions:
+            return sum(1 for _ in itertools.islice(solutions, limit))
+
+    def has_unique_solution(self) -> bool:
+        return self.count_solutions(limit=2) == 1
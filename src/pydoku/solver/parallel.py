@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import time
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Generator, NamedTuple
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.solver.abc import Solver
+
+# Compact per-puzzle outcome written by the workers next to each solution
+STATUS_DTYPE: np.dtype = np.dtype([("solved", np.bool_), ("time", np.float32)])
+
+
+class SolveChunk(NamedTuple):
+    start: int  # Index of the first puzzle of the chunk in the input batch
+    solutions: np.ndarray  # (chunk, cells) uint8 grids
+    status: np.ndarray  # (chunk,) STATUS_DTYPE records
+
+
+# Shared buffers attached once per worker process by the pool initializer
+_worker: dict[str, Any] = {}
+
+
+def _attach_worker(
+    names: tuple[str, str, str],
+    shape: tuple[int, int],
+    solver_cls: type[Solver],
+    solver_kwargs: dict[str, Any],
+    timeout: float | None,
+) -> None:
+    blocks: list[SharedMemory] = [SharedMemory(name, track=False) for name in names]
+    _worker["blocks"] = blocks
+    _worker["puzzles"] = np.ndarray(shape, dtype=np.uint8, buffer=blocks[0].buf)
+    _worker["solutions"] = np.ndarray(shape, dtype=np.uint8, buffer=blocks[1].buf)
+    _worker["status"] = np.ndarray(shape[:1], dtype=STATUS_DTYPE, buffer=blocks[2].buf)
+    _worker["solver_cls"] = solver_cls
+    _worker["solver_kwargs"] = solver_kwargs
+    _worker["solver"] = None
+    _worker["timeout"] = timeout
+
+
+def _solve_range(bounds: tuple[int, int]) -> tuple[int, int]:
+    puzzles: np.ndarray = _worker["puzzles"]
+    solutions: np.ndarray = _worker["solutions"]
+    status: np.ndarray = _worker["status"]
+    for i in range(*bounds):
+        start: float = time.perf_counter()
+        # Solve in place inside the shared solution buffer
+        solutions[i] = puzzles[i]
+        # Each worker keeps one solver and resets it between puzzles
+        solver: Solver | None = _worker["solver"]
+        if solver is None:
+            sudoku: Sudoku = Sudoku.from_array(solutions[i])
+            solver = _worker["solver"] = _worker["solver_cls"](
+                sudoku, **_worker["solver_kwargs"]
+            )
+        else:
+            solver.reset(solutions[i])
+        solver.setup()
+        solved: bool = bool(solver.solve(timeout=_worker["timeout"]))
+        status[i] = (solved, time.perf_counter() - start)
+    return bounds
+
+
+def solve_many(
+    puzzles: np.ndarray,
+    solver_cls: type[Solver],
+    workers: int | None = None,
+    chunk_size: int = 256,
+    ordered: bool = True,
+    solver_kwargs: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> Generator[SolveChunk, None, None]:
+    """Solve an `(N, cells)` batch across a process pool, yielding finished chunks.
+
+    Puzzles, solutions and statuses live in shared memory so that workers only
+    receive `(start, stop)` bounds. Chunks are yielded in input order when
+    `ordered`, otherwise as soon as any worker completes them. A `timeout` caps
+    each puzzle's search so that one pathological puzzle cannot stall a worker.
+    """
+    puzzles = np.ascontiguousarray(np.atleast_2d(puzzles), dtype=np.uint8)
+    shape: tuple[int, int] = puzzles.shape  # type: ignore[assignment]
+    sizes: tuple[int, ...] = (
+        puzzles.nbytes,
+        puzzles.nbytes,
+        shape[0] * STATUS_DTYPE.itemsize,
+    )
+    blocks: list[SharedMemory] = [
+        SharedMemory(create=True, size=max(size, 1)) for size in sizes
+    ]
+    # Views must be released before the blocks they export can be closed
+    views: list[np.ndarray] = [
+        np.ndarray(shape, dtype=np.uint8, buffer=blocks[0].buf),
+        np.ndarray(shape, dtype=np.uint8, buffer=blocks[1].buf),
+        np.ndarray(shape[:1], dtype=STATUS_DTYPE, buffer=blocks[2].buf),
+    ]
+    try:
+        views[0][...] = puzzles
+        bounds: list[tuple[int, int]] = [
+            (i, min(i + chunk_size, shape[0])) for i in range(0, shape[0], chunk_size)
+        ]
+        initargs: tuple = (
+            tuple(block.name for block in blocks),
+            shape,
+            solver_cls,
+            solver_kwargs or {},
+            timeout,
+        )
+        with mp.Pool(workers or os.cpu_count(), _attach_worker, initargs) as pool:
+            dispatch = pool.imap if ordered else pool.imap_unordered
+            for start, stop in dispatch(_solve_range, bounds):
+                yield SolveChunk(
+                    start, views[1][start:stop].copy(), views[2][start:stop].copy()
+                )
+    finally:
+        views.clear()
+        for block in blocks:
+            block.close()
+            block.unlink()
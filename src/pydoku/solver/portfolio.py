@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import time
+import multiprocessing as mp
+from multiprocessing.connection import Connection, wait
+from typing import Any, cast
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.solver.abc import Solver
+from pydoku.solver.stats import SolverStats, timed
+from pydoku.solver.budget import CancellationToken, SolveResult, SolveStatus
+from pydoku.solver.backtracking import BackTrackingSolver
+from pydoku.solver.exactcover import ExactCoverSolver
+from pydoku.solver.stochastic import StochasticSolver
+
+# Engines raced by default, by the name reported when one of them wins
+DEFAULT_ENGINES: dict[str, tuple[type[Solver], dict[str, Any]]] = {
+    "exactcover": (ExactCoverSolver, {}),
+    "backtracking": (BackTrackingSolver, {"dynamic_order": True}),
+    "stochastic": (StochasticSolver, {}),
+}
+
+# Outcomes that settle the race, annealing running out of steps does not
+DECISIVE: tuple[SolveStatus, ...] = (SolveStatus.SOLVED, SolveStatus.UNSAT)
+
+
+def _race(
+    conn: Connection,
+    solver_cls: type[Solver],
+    solver_kwargs: dict[str, Any],
+    cells: np.ndarray,
+    max_nodes: int | None,
+) -> None:
+    try:
+        solver: Solver = solver_cls(Sudoku.from_array(cells), **solver_kwargs)
+        solver.setup()
+        result: SolveResult = solver.solve(max_nodes=max_nodes)
+        conn.send((result.status, solver.sudoku.cells, result.stats))
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+class PortfolioSolver(Solver):
+    """Race several configured solvers on one puzzle in separate processes.
+
+    The first engine to solve the puzzle or prove it unsat wins and every
+    other process is killed straight away. The winning engine's name and
+    counters are kept on the solver.
+    """
+
+    def __init__(
+        self,
+        sudoku: Sudoku,
+        engines: dict[str, tuple[type[Solver], dict[str, Any]]] | None = None,
+        poll_interval: float = 0.01,
+    ):
+        super().__init__(sudoku)
+        self.engines: dict[str, tuple[type[Solver], dict[str, Any]]] = (
+            engines or DEFAULT_ENGINES
+        )
+        # How often the race checks the deadline and cancellation token
+        self.poll_interval: float = poll_interval
+        self.winner: str | None = None
+
+    @timed("setup")
+    def setup(self, *args, **kwargs) -> bool:
+        super().setup(*args, **kwargs)
+        self.winner = None
+        self.consistent: bool = self.sudoku.is_valid()
+        return False
+
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        super().solve(timeout, max_nodes, cancel)
+        if not self.consistent:
+            return self._result(False)
+        status: SolveStatus = self._race(timeout, max_nodes, cancel)
+        self.sudoku.refresh()
+        return self._result(status)
+
+    def _race(
+        self,
+        timeout: float | None,
+        max_nodes: int | None,
+        cancel: CancellationToken | None,
+    ) -> SolveStatus:
+        now: float = time.perf_counter()
+        deadline: float | None = None if timeout is None else now + timeout
+        cells: np.ndarray = np.array(self.sudoku.cells, copy=True)
+        pending: dict[Connection, str] = {}
+        processes: list[mp.Process] = []
+        errors: list[Exception] = []
+        try:
+            for name, (solver_cls, solver_kwargs) in self.engines.items():
+                recv, send = mp.Pipe(duplex=False)
+                process: mp.Process = mp.Process(
+                    target=_race,
+                    args=(send, solver_cls, solver_kwargs, cells, max_nodes),
+                    daemon=True,
+                )
+                process.start()
+                send.close()
+                pending[recv] = name
+                processes.append(process)
+            while pending:
+                if cancel is not None and cancel.cancelled:
+                    return SolveStatus.CANCELLED
+                wait_for: float = self.poll_interval
+                if deadline is not None:
+                    if (remaining := deadline - time.perf_counter()) <= 0:
+                        return SolveStatus.BUDGET_EXCEEDED
+                    wait_for = min(wait_for, remaining)
+                # Only pipe ends are waited on, never sockets or raw handles
+                for conn in cast(list[Connection], wait(list(pending), wait_for)):
+                    name = pending.pop(conn)
+                    try:
+                        message: Any = conn.recv()
+                    except EOFError:
+                        continue  # The engine process died without answering
+                    finally:
+                        # Each engine answers once, so its pipe is done with
+                        conn.close()
+                    if isinstance(message, Exception):
+                        errors.append(message)
+                        continue
+                    status, solution, stats = message
+                    if status in DECISIVE:
+                        self._record_winner(name, status, solution, stats)
+                        return status
+            if errors and len(errors) == len(self.engines):
+                raise RuntimeError("Every portfolio engine failed") from errors[0]
+            return SolveStatus.BUDGET_EXCEEDED
+        finally:
+            # Losers are killed rather than asked to stop, and pipes still
+            # awaiting an answer are closed along with them
+            for conn in pending:
+                conn.close()
+            for process in processes:
+                if process.is_alive():
+                    process.kill()
+                process.join()
+
+    def _record_winner(
+        self,
+        name: str,
+        status: SolveStatus,
+        solution: np.ndarray,
+        stats: SolverStats,
+    ) -> None:
+        self.winner = name
+        self.num_nodes = stats.nodes
+        self.num_backtracks = stats.backtracks
+        self.max_depth = stats.max_depth
+        if status is SolveStatus.SOLVED:
+            self.sudoku.cells[...] = solution
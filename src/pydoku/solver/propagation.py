@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+from typing import NamedTuple
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+
+
+class Propagation(NamedTuple):
+    fixed: int  # Cells assigned a value by propagation
+    eliminated: int  # Candidates removed from the tensor
+    consistent: bool  # False when some unit can no longer be completed
+
+
+class Propagator:
+    """Constraint propagation over a `(n, n, n + 1)` boolean candidate tensor.
+
+    The tensor uses the same layout as `BackTrackingSolver.search_space`, where
+    `candidates[row, col, v]` marks value `v` as possible and index 0 is unused.
+    Rules are applied until a fixpoint, writing fixed cells into the sudoku.
+    """
+
+    def __init__(
+        self,
+        naked_singles: bool = True,
+        hidden_singles: bool = True,
+        locked_candidates: bool = True,
+    ):
+        self.naked_singles: bool = naked_singles
+        self.hidden_singles: bool = hidden_singles
+        self.locked_candidates: bool = locked_candidates
+
+    @classmethod
+    def candidates(cls, sudoku: Sudoku) -> np.ndarray:
+        """Build a full candidate tensor for a sudoku before any elimination."""
+        shape: tuple[int, int, int] = (*sudoku.shape, sudoku.grid_size + 1)
+        candidates: np.ndarray = np.ones(shape, dtype=np.bool_)
+        candidates[:, :, 0] = False
+        return candidates
+
+    @classmethod
+    def eliminate(cls, sudoku: Sudoku) -> np.ndarray:
+        """Candidate tensor after a single pass removing placed values from units."""
+        candidates: np.ndarray = cls.candidates(sudoku)
+        cls._eliminate_placed(sudoku, candidates)
+        return candidates
+
+    def propagate(self, sudoku: Sudoku, candidates: np.ndarray) -> Propagation:
+        """Reduce candidates and fix cells in place until no rule makes progress."""
+        initial: int = int(np.count_nonzero(candidates))
+        empty: int = int(np.count_nonzero(sudoku.cells == 0))
+        consistent: bool = True
+        while consistent:
+            self._eliminate_placed(sudoku, candidates)
+            if not (consistent := self._is_consistent(sudoku, candidates)):
+                break
+            if self.naked_singles:
+                if self._place(sudoku, self._naked(sudoku, candidates)):
+                    continue
+            if self.hidden_singles:
+                hidden: np.ndarray = self._hidden(sudoku, candidates)
+                if np.any(np.count_nonzero(hidden, axis=-1) > 1):
+                    consistent = False
+                    break
+                if self._place(sudoku, hidden):
+                    continue
+            if self.locked_candidates and self._locked(sudoku, candidates):
+                continue
+            break
+        sudoku.refresh()
+        return Propagation(
+            fixed=empty - int(np.count_nonzero(sudoku.cells == 0)),
+            eliminated=initial - int(np.count_nonzero(candidates)),
+            consistent=consistent,
+        )
+
+    @classmethod
+    def _one_hot(cls, sudoku: Sudoku) -> np.ndarray:
+        values: np.ndarray = np.arange(sudoku.grid_size + 1, dtype=sudoku.cells.dtype)
+        placed: np.ndarray = sudoku.cells[:, :, None] == values
+        placed[:, :, 0] = False
+        return placed
+
+    @classmethod
+    def _boxes(cls, sudoku: Sudoku, tensor: np.ndarray) -> np.ndarray:
+        # View as (box_row, row_in_box, box_col, col_in_box, value)
+        d: int = sudoku.box_size
+        return tensor.reshape(d, d, d, d, -1)
+
+    @classmethod
+    def _eliminate_placed(cls, sudoku: Sudoku, candidates: np.ndarray) -> None:
+        placed: np.ndarray = cls._one_hot(sudoku)
+        used: np.ndarray = placed.any(axis=1, keepdims=True) | placed.any(
+            axis=0, keepdims=True
+        )
+        used_boxes: np.ndarray = cls._boxes(sudoku, used)
+        used_boxes |= cls._boxes(sudoku, placed).any(axis=(1, 3), keepdims=True)
+        filled: np.ndarray = sudoku.cells != 0
+        candidates &= ~used
+        candidates[filled] = placed[filled]
+
+    @classmethod
+    def _is_consistent(cls, sudoku: Sudoku, candidates: np.ndarray) -> bool:
+        # No value placed twice in a unit, every empty cell has a candidate left
+        # and every value still has a place in every unit
+        placed: np.ndarray = cls._one_hot(sudoku)
+        for axis in (0, 1):
+            if np.any(np.count_nonzero(placed, axis=axis) > 1):
+                return False
+        if np.any(np.count_nonzero(cls._boxes(sudoku, placed), axis=(1, 3)) > 1):
+            return False
+        if np.any(~candidates.any(axis=-1) & (sudoku.cells == 0)):
+            return False
+        boxes: np.ndarray = cls._boxes(sudoku, candidates).any(axis=(1, 3))
+        for seen in (candidates.any(axis=1), candidates.any(axis=0), boxes):
+            if not np.all(seen[..., 1:]):
+                return False
+        return True
+
+    @classmethod
+    def _naked(cls, sudoku: Sudoku, candidates: np.ndarray) -> np.ndarray:
+        single: np.ndarray = (np.count_nonzero(candidates, axis=-1) == 1) & (
+            sudoku.cells == 0
+        )
+        return candidates & single[:, :, None]
+
+    @classmethod
+    def _hidden(cls, sudoku: Sudoku, candidates: np.ndarray) -> np.ndarray:
+        open_candidates: np.ndarray = candidates & (sudoku.cells == 0)[:, :, None]
+        rows: np.ndarray = np.count_nonzero(open_candidates, axis=1, keepdims=True)
+        cols: np.ndarray = np.count_nonzero(open_candidates, axis=0, keepdims=True)
+        single: np.ndarray = (rows == 1) | (cols == 1)
+        single_boxes: np.ndarray = cls._boxes(sudoku, single)
+        single_boxes |= (
+            np.count_nonzero(
+                cls._boxes(sudoku, open_candidates), axis=(1, 3), keepdims=True
+            )
+            == 1
+        )
+        return open_candidates & single
+
+    @classmethod
+    def _place(cls, sudoku: Sudoku, singles: np.ndarray) -> bool:
+        rows, cols, values = np.nonzero(singles)
+        if rows.size == 0:
+            return False
+        sudoku.cells[rows, cols] = values
+        return True
+
+    @classmethod
+    def _locked(cls, sudoku: Sudoku, candidates: np.ndarray) -> bool:
+        before: int = int(np.count_nonzero(candidates))
+        # Rows of the grid, then columns by swapping the box axes of the same view
+        boxes: np.ndarray = cls._boxes(sudoku, candidates)
+        for view in (boxes, boxes.transpose(2, 3, 0, 1, 4)):
+            cls._locked_lines(view)
+        return int(np.count_nonzero(candidates)) != before
+
+    @classmethod
+    def _locked_lines(cls, boxes: np.ndarray) -> None:
+        # Value present anywhere within the segment of a line crossing a box
+        segments: np.ndarray = boxes.any(axis=3)
+        # Pointing: a box holds the value on a single line so clear it elsewhere
+        pointing: np.ndarray = segments & (segments.sum(axis=1, keepdims=True) == 1)
+        outside: np.ndarray = pointing.sum(axis=2, keepdims=True) - pointing > 0
+        # Claiming: a line holds the value in a single box so clear the box elsewhere
+        claiming: np.ndarray = segments & (segments.sum(axis=2, keepdims=True) == 1)
+        inside: np.ndarray = claiming.sum(axis=1, keepdims=True) - claiming > 0
+        boxes &= ~(outside | inside)[:, :, :, None, :]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+from pydoku.solver.abc import Solver
+from pydoku.solver.backtracking import BackTrackingSolver
+from pydoku.solver.exactcover import ExactCoverSolver
+from pydoku.solver.stochastic import StochasticSolver
+from pydoku.solver.portfolio import PortfolioSolver
+from pydoku.solver.auto import AutoSolver
+
+# Search engines the routing table may choose between
+ENGINES: dict[str, type[Solver]] = {
+    "backtracking": BackTrackingSolver,
+    "exactcover": ExactCoverSolver,
+    "stochastic": StochasticSolver,
+}
+
+# Every solver selectable by name, engines first
+SOLVERS: dict[str, type[Solver]] = {
+    **ENGINES,
+    "portfolio": PortfolioSolver,
+    "auto": AutoSolver,
+}
+
+
+def register_solver(name: str, solver_cls: type[Solver], engine: bool = False) -> None:
+    """Make a solver selectable by name, and routable if it is an `engine`."""
+    if name in SOLVERS:
+        raise ValueError(f"Solver is already registered: {name}")
+    SOLVERS[name] = solver_cls
+    if engine:
+        ENGINES[name] = solver_cls
+
+
+def get_solver(name: str) -> type[Solver]:
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown solver: {name} (choose from {', '.join(SOLVERS)})"
+        ) from None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import json
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.solver.propagation import Propagator
+
+# Engine per puzzle class, calibrated with `pydoku.benchmark --calibrate` on
+# generated 4x4 and 9x9 corpora. Classes are the grid size and the smallest
+# bucket edge covering the fraction of cells open and not a naked single.
+ROUTING: dict[str, Any] = {
+    "open_buckets": [0.0, 0.25, 0.5, 0.75, 1.0],
+    "default": "exactcover",
+    "classes": {
+        "4x4/0.0": "backtracking",
+        "4x4/0.25": "backtracking",
+        "4x4/0.5": "backtracking",
+        "4x4/0.75": "backtracking",
+        "9x9/0.25": "backtracking",
+        "9x9/0.5": "backtracking",
+        "9x9/0.75": "exactcover",
+    },
+}
+
+
+class PuzzleFeatures(NamedTuple):
+    grid_size: int
+    clues: int
+    open_cells: int  # Empty cells
+    singles: int  # Empty cells left with one candidate after a single pass
+    consistent: bool  # False when a unit repeats a value or a cell has no candidate
+    histogram: tuple[int, ...]  # Empty cells by candidate count after that pass
+
+
+def extract_features(sudoku: Sudoku) -> PuzzleFeatures:
+    """Describe a puzzle from one elimination pass, leaving the sudoku as is.
+
+    A full propagation fixpoint costs more than solving most 9x9 puzzles, so
+    only the first step is taken and the naked singles it exposes stand in for
+    how far propagation would get.
+    """
+    candidates: np.ndarray = Propagator.eliminate(sudoku)
+    open_mask: np.ndarray = sudoku.cells == 0
+    counts: np.ndarray = np.count_nonzero(candidates[open_mask], axis=-1)
+    histogram: np.ndarray = np.bincount(counts, minlength=sudoku.grid_size + 1)
+    return PuzzleFeatures(
+        grid_size=sudoku.grid_size,
+        clues=sudoku.cells.size - counts.size,
+        open_cells=counts.size,
+        singles=int(histogram[1]),
+        consistent=not histogram[0] and sudoku.is_valid(),
+        histogram=tuple(int(count) for count in histogram),
+    )
+
+
+def puzzle_class(features: PuzzleFeatures, routing: dict[str, Any] = ROUTING) -> str:
+    """Label a puzzle as `<n>x<n>/<bucket>` for the routing table."""
+    n: int = features.grid_size
+    fraction: float = (features.open_cells - features.singles) / (n * n)
+    edges: list[float] = routing["open_buckets"]
+    bucket: float = next((edge for edge in edges if fraction <= edge), edges[-1])
+    return f"{n}x{n}/{bucket}"
+
+
+def route(features: PuzzleFeatures, routing: dict[str, Any] = ROUTING) -> str:
+    """Name of the engine expected to be fastest on a puzzle."""
+    return routing["classes"].get(puzzle_class(features, routing), routing["default"])
+
+
+def calibrate(
+    report: dict[str, Any],
+    engines: set[str] | None = None,
+    base: dict[str, Any] = ROUTING,
+) -> dict[str, Any]:
+    """Build a routing table from the per-class timings of a benchmark report.
+
+    Each class goes to the engine with the lowest mean latency among those that
+    solved every puzzle of the class; classes none of them solved are left to
+    the default engine.
+    """
+    classes: dict[str, str] = {}
+    for label, entry in sorted(report.get("classes", {}).items()):
+        timings: list[tuple[float, str]] = [
+            (result["mean"], name)
+            for name, result in entry["solvers"].items()
+            if result["solved"] == entry["puzzles"]
+            and (engines is None or name in engines)
+        ]
+        if timings:
+            classes[label] = min(timings)[1]
+    return {
+        "open_buckets": list(base["open_buckets"]),
+        "default": base["default"],
+        "classes": classes,
+    }
+
+
+def load_routing(path: str | os.PathLike) -> dict[str, Any]:
+    with open(path) as fp:
+        routing: dict[str, Any] = json.load(fp)
+    for key in ("open_buckets", "default", "classes"):
+        if key not in routing:
+            raise ValueError(f"Routing table is missing {key!r}: {path}")
+    return routing
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import time
+import functools
+from typing import Any, Callable, NamedTuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Search event callback invoked as `trace(event, depth, nodes)`, where events are
+# "place" for a tentative placement and "backtrack" for undoing one
+TraceHook = Callable[[str, int, int], None]
+
+
+class SolverStats(NamedTuple):
+    nodes: int  # Tentative placements made by the search
+    backtracks: int  # Placements undone after their subtree failed
+    max_depth: int  # Deepest number of simultaneous placements reached
+    fixed: int  # Cells assigned by propagation during setup
+    eliminated: int  # Candidates removed by propagation during setup
+    setup_time: float  # Seconds spent in the last setup()
+    solve_time: float  # Seconds spent in the last solve()
+
+
+def timed(phase: str) -> Callable[[F], F]:
+    """Record the duration of a solver method as `self.<phase>_time`."""
+
+    def decorator(method: F) -> F:
+        attribute: str = f"{phase}_time"
+
+        @functools.wraps(method)
+        def wrapper(self: Any, *args, **kwargs) -> Any:
+            start: float = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                setattr(self, attribute, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
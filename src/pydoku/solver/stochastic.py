@@ -1,39 +1,201 @@
-# #!/usr/bin/env python3
-# # -*- coding:utf-8 -*-
-
-# import numpy as np
-
-# x = "500670084407000630068000701000000209050980460679042518105869047796400852003720096"
-# y = "532671984417298635968534721384156279251987463679342518125869347796413852843725196"
-
-
-# shape = (9, 9)
-
-# grid = np.asarray(list(x), dtype=np.uint8).reshape(shape)
-# frozen = grid != 0
-
-# allocate = np.random.randint(1, 9, shape)
-# allocate[frozen] = grid[frozen]
-# print(allocate, grid)
-
-# """
-
-#     https://en.wikipedia.org/wiki/Simulated_annealing#Pseudocode
-
-
-# """
-
-
-# # class StochasticSolver(Solver):
-# #     def solve(self) -> bool:
-# #         return False
-# #         # return self._backtrack(self.grid, 0, self.validator)
-
-
-# # with open(file="examples.csv", mode="r") as fp:
-# #     problems = fp.readlines()
-
-
-# # grid = [Grid(x) for x in problems][0]
-
-# # print(grid)
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import numpy as np
+
+from pydoku.sudoku import Sudoku
+from pydoku.geometry import Geometry
+from pydoku.validation import unit_counts
+from pydoku.solver.abc import Solver
+from pydoku.solver.propagation import Propagator
+from pydoku.solver.stats import timed
+from pydoku.solver.budget import (
+    BudgetExceeded,
+    CancellationToken,
+    SolveResult,
+    SolveStatus,
+)
+
+
+class StochasticSolver(Solver):
+    """Simulated annealing over box permutations, run as a batch of chains.
+
+    Every chain fills each box with a permutation of its missing digits, so
+    only row and column conflicts remain. A move swaps two open cells of one
+    box and its cost delta is read from per-chain unit counts, making a step
+    a fixed number of numpy operations across all chains regardless of the
+    grid size. Chains cool geometrically and are reheated once they stall.
+    """
+
+    def __init__(
+        self,
+        sudoku: Sudoku,
+        num_chains: int = 64,
+        max_steps: int = 100_000,
+        temperature: float | None = None,
+        cooling: float = 0.999,
+        reheat_after: int = 5_000,
+        seed: int | None = None,
+        propagator: Propagator | None = None,
+    ):
+        super().__init__(sudoku, propagator)
+        self.num_chains: int = num_chains
+        self.max_steps: int = max_steps
+        # Starting temperature, estimated from the spread of initial costs if None
+        self.temperature: float | None = temperature
+        self.cooling: float = cooling
+        self.reheat_after: int = reheat_after
+        self.seed: int | None = seed
+        self.num_steps: int = 0
+
+    @timed("setup")
+    def setup(self, *args, **kwargs) -> bool:
+        super().setup(*args, **kwargs)
+        # A fresh generator per setup so every puzzle replays the same seed
+        self.rng: np.random.Generator = np.random.default_rng(self.seed)
+        self.consistent: bool = self.propagate() and self.sudoku.is_valid()
+        if not self.consistent:
+            # Boxes repeating a given cannot be filled with their missing digits
+            return False
+        self._setup_boxes()
+        self._setup_chains()
+        return False
+
+    def solve(
+        self,
+        timeout: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> SolveResult:
+        super().solve(timeout, max_nodes, cancel)
+        if not self.consistent:
+            return self._result(False)
+        try:
+            solved: bool = self._anneal()
+        except BudgetExceeded as e:
+            self.num_nodes = self.num_steps * self.num_chains
+            return self._result(e.status)
+        self.num_nodes = self.num_steps * self.num_chains
+        self.sudoku.refresh()
+        # Annealing cannot prove a puzzle unsat, running out of steps is a budget
+        return self._result(solved or SolveStatus.BUDGET_EXCEEDED)
+
+    def _setup_boxes(self) -> None:
+        # Open cells of each box padded to `n` and the digits each box is missing
+        n: int = self.sudoku.grid_size
+        grid: Geometry = self.sudoku.geometry
+        cells: np.ndarray = self.sudoku.cells.reshape(-1)
+        self.cell_rows: np.ndarray = grid.rows
+        self.cell_cols: np.ndarray = grid.cols
+        self.box_cells: np.ndarray = np.zeros((n, n), dtype=np.intp)
+        self.box_open: np.ndarray = np.zeros(n, dtype=np.intp)
+        self.box_missing: list[np.ndarray] = []
+        for box, members in enumerate(grid.box_cells):
+            idxs: np.ndarray = members[cells[members] == 0]
+            self.box_cells[box, : idxs.size] = idxs
+            self.box_open[box] = idxs.size
+            self.box_missing.append(np.setdiff1d(np.arange(1, n + 1), cells[members]))
+
+    def _setup_chains(self) -> None:
+        # Every chain starts from an independent random permutation of each box
+        chains: int = self.num_chains
+        self.grids: np.ndarray = np.tile(self.sudoku.cells.reshape(-1), (chains, 1))
+        for box, missing in enumerate(self.box_missing):
+            idxs: np.ndarray = self.box_cells[box, : self.box_open[box]]
+            self.grids[:, idxs] = self.rng.permuted(
+                np.tile(missing, (chains, 1)), axis=1
+            )
+        self.row_counts, self.col_counts, _ = unit_counts(self.grids)
+        self.costs: np.ndarray = sum(  # type: ignore[assignment]
+            np.maximum(counts[:, :, 1:] - 1, 0).sum(axis=(1, 2))
+            for counts in (self.row_counts, self.col_counts)
+        )
+        if self.temperature is None:
+            spread: float = float(np.std(self.costs))
+            self.start_temperature: float = spread if spread > 0 else 1.0
+        else:
+            self.start_temperature = self.temperature
+        self.temperatures: np.ndarray = np.full(chains, self.start_temperature)
+        self.stale: np.ndarray = np.zeros(chains, dtype=np.intp)
+
+    def _draw_moves(self, steps: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Pairs of distinct open cells within a random box, plus acceptance draws
+        movable: np.ndarray = np.flatnonzero(self.box_open >= 2)
+        shape: tuple[int, int] = (steps, self.num_chains)
+        boxes: np.ndarray = movable[self.rng.integers(movable.size, size=shape)]
+        size: np.ndarray = self.box_open[boxes]
+        i: np.ndarray = (self.rng.random(shape) * size).astype(np.intp)
+        j: np.ndarray = (self.rng.random(shape) * (size - 1)).astype(np.intp)
+        j += j >= i
+        draws: np.ndarray = self.rng.random(shape)
+        return self.box_cells[boxes, i], self.box_cells[boxes, j], draws
+
+    def _anneal(self, block: int = 256) -> bool:
+        chains: np.ndarray = np.arange(self.num_chains)
+        grids: np.ndarray = self.grids
+        rows: np.ndarray = self.row_counts
+        cols: np.ndarray = self.col_counts
+        costs: np.ndarray = self.costs
+        self.num_steps = 0
+        if not np.any(self.box_open >= 2):
+            return self._finish()
+        while self.num_steps < self.max_steps and costs.min() > 0:
+            for p, q, draw in zip(*self._draw_moves(block)):
+                a: np.ndarray = grids[chains, p]
+                b: np.ndarray = grids[chains, q]
+                r1, c1 = self.cell_rows[p], self.cell_cols[p]
+                r2, c2 = self.cell_rows[q], self.cell_cols[q]
+                # A unit gains a conflict when the incoming digit is already there
+                # and loses one when the outgoing digit was duplicated
+                delta: np.ndarray = (r1 != r2) * (
+                    np.minimum(rows[chains, r1, b], 1)
+                    - np.minimum(rows[chains, r1, a] - 1, 1)
+                    + np.minimum(rows[chains, r2, a], 1)
+                    - np.minimum(rows[chains, r2, b] - 1, 1)
+                ) + (c1 != c2) * (
+                    np.minimum(cols[chains, c1, b], 1)
+                    - np.minimum(cols[chains, c1, a] - 1, 1)
+                    + np.minimum(cols[chains, c2, a], 1)
+                    - np.minimum(cols[chains, c2, b] - 1, 1)
+                )
+                # Improving moves always pass, capped to avoid overflow when cold
+                energy: np.ndarray = np.minimum(-delta / self.temperatures, 0.0)
+                accept: np.ndarray = draw < np.exp(energy)
+                m: np.ndarray = chains[accept]
+                am, bm = a[accept], b[accept]
+                grids[m, p[accept]] = bm
+                grids[m, q[accept]] = am
+                for counts, u1, u2 in ((rows, r1, r2), (cols, c1, c2)):
+                    counts[m, u1[accept], am] -= 1
+                    counts[m, u1[accept], bm] += 1
+                    counts[m, u2[accept], bm] -= 1
+                    counts[m, u2[accept], am] += 1
+                costs[m] += delta[accept]
+                self.num_steps += 1
+                if self.num_steps * self.num_chains >= self._next_check:
+                    self._check_budget(self.num_steps * self.num_chains)
+
+                # Cool every chain and reheat the ones without recent improvement
+                improved: np.ndarray = accept & (delta < 0)
+                self.stale[improved] = 0
+                self.stale[~improved] += 1
+                self.temperatures *= self.cooling
+                stalled: np.ndarray = self.stale >= self.reheat_after
+                self.temperatures[stalled] = self.start_temperature
+                self.stale[stalled] = 0
+                if costs.min() == 0 or self.num_steps >= self.max_steps:
+                    break
+        return self._finish()
+
+    def _finish(self) -> bool:
+        best: int = int(np.argmin(self.costs))
+        if self.costs[best] != 0:
+            return False
+        n: int = self.sudoku.grid_size
+        self.sudoku.cells[...] = self.grids[best].reshape(n, n)
+        return True
+
+    @property
+    def best_cost(self) -> int:
+        """Fewest row and column conflicts reached by any chain."""
+        return int(self.costs.min())
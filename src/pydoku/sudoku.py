@@ -1,22 +1,79 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 
+import math
+
 import numpy as np
 
+from pydoku.loader import INVALID_CELL, cell_lookup
+from pydoku.geometry import Geometry, cells_geometry
+from pydoku.validation import unit_counts
+
 
 class Sudoku:
+    __slots__ = (
+        "cells",
+        "frozen",
+        "grid_size",
+        "box_size",
+        "shape",
+        "geometry",
+        "row_counts",
+        "col_counts",
+        "box_counts",
+        "conflicts",
+        "empty",
+    )
+
     def __init__(self, *, cells: str):
-        self.cells: np.ndarray = self._cells_str_to_array(cells)
-        self.cells_frozen: np.ndarray = np.copy(self.cells)
-        self.grid_size: int = int(np.sqrt(self.cells.size))
-        self.box_size: int = int(np.sqrt(self.grid_size))
-        self.shape: tuple[int, int] = (self.grid_size, self.grid_size)
+        self._bind(self._cells_str_to_array(cells))
+
+    @classmethod
+    def from_array(cls, cells: np.ndarray) -> "Sudoku":
+        """Wrap a flat or square uint8 array, such as a row of an `(N, cells)` batch.
+
+        The sudoku shares memory with `cells`, so solving writes into it. Only
+        arrays of another dtype or a non-contiguous layout are copied.
+        """
+        sudoku: Sudoku = cls.__new__(cls)
+        sudoku._bind(np.asarray(cells, dtype=np.uint8))
+        return sudoku
+
+    @classmethod
+    def from_bytes(cls, cells: bytes | bytearray | memoryview) -> "Sudoku":
+        """Wrap a buffer of raw cell values (not text) without copying.
+
+        Immutable `bytes` give a read-only grid, pass a `bytearray` to solve.
+        """
+        return cls.from_array(np.frombuffer(cells, dtype=np.uint8))
+
+    def _bind(self, cells: np.ndarray) -> None:
+        geometry: Geometry = cells_geometry(cells.size)
+        grid_size: int = geometry.grid_size
+        if (value := int(cells.max())) > grid_size:
+            raise ValueError(f"Cell value out of range: {value}")
+        self.cells: np.ndarray = cells.reshape((grid_size, grid_size))
+        # Givens as a boolean mask, values are recovered through `cells_frozen`
+        self.frozen: np.ndarray = self.cells != 0
+        self.grid_size: int = grid_size
+        self.box_size: int = geometry.box_size
+        self.shape: tuple[int, int] = (grid_size, grid_size)
+        self.geometry: Geometry = geometry
+        self.refresh()
+
+    @property
+    def cells_frozen(self) -> np.ndarray:
+        """Copy of the givens with every other cell empty."""
+        return np.where(self.frozen, self.cells, 0).astype(np.uint8)
 
     @classmethod
     def _cells_str_to_array(cls, cells: str) -> np.ndarray:
-        tmp_cells: list[int] = [int(x) for x in cells]
-        dim: int = int(np.sqrt(len(tmp_cells)))
-        return np.asarray(tmp_cells, dtype=np.uint8).reshape((dim, dim))
+        # Digits, `.` and letters from 10 upwards as in the line-oriented format
+        lookup: np.ndarray = cell_lookup(math.isqrt(len(cells)))
+        values: np.ndarray = lookup[np.frombuffer(cells.encode(), dtype=np.uint8)]
+        if np.any(values == INVALID_CELL):
+            raise ValueError(f"Puzzle has invalid cells: {cells}")
+        return values
 
     def __str__(self) -> str:
         return self.cells.__str__()
@@ -24,6 +81,64 @@ class Sudoku:
     def __repr__(self) -> str:
         return self.cells.__repr__()
 
+    def refresh(self) -> None:
+        """Recount unit digits, conflicts and empty cells from the raw cells.
+
+        Needed after writing to `cells` directly instead of through `set_cell`.
+        """
+        counts: tuple[np.ndarray, ...] = unit_counts(self.cells.reshape(1, -1))
+        # Each extra copy of a digit within a unit counts as one conflict
+        self.conflicts: int = sum(
+            int(np.maximum(unit[0, :, 1:] - 1, 0).sum()) for unit in counts
+        )
+        # Counts never exceed the grid size, so bytes keep instances small
+        self.row_counts: np.ndarray = counts[0][0].astype(np.uint8)
+        self.col_counts: np.ndarray = counts[1][0].astype(np.uint8)
+        self.box_counts: np.ndarray = counts[2][0].astype(np.uint8)
+        self.empty: int = int(np.count_nonzero(self.cells == 0))
+
+    def set_cell(self, row: int, col: int, value: int) -> None:
+        """Place a value (0 clears) and update the validity state in O(1)."""
+        if not 0 <= value <= self.grid_size:
+            raise ValueError(f"Cell value out of range: {value}")
+        if self.frozen[row, col]:
+            raise ValueError(f"Cell is frozen: ({row}, {col})")
+        if self.cells[row, col] != 0:
+            self.clear_cell(row, col)
+        if value == 0:
+            return
+        box: int = int(self.geometry.boxes[row * self.grid_size + col])
+        for counts, unit in (
+            (self.row_counts, row),
+            (self.col_counts, col),
+            (self.box_counts, box),
+        ):
+            if counts[unit, value] > 0:
+                self.conflicts += 1
+            counts[unit, value] += 1
+            counts[unit, 0] -= 1
+        self.cells[row, col] = value
+        self.empty -= 1
+
+    def clear_cell(self, row: int, col: int) -> None:
+        """Empty a cell and update the validity state in O(1)."""
+        if self.frozen[row, col]:
+            raise ValueError(f"Cell is frozen: ({row}, {col})")
+        if (value := int(self.cells[row, col])) == 0:
+            return
+        box: int = int(self.geometry.boxes[row * self.grid_size + col])
+        for counts, unit in (
+            (self.row_counts, row),
+            (self.col_counts, col),
+            (self.box_counts, box),
+        ):
+            counts[unit, value] -= 1
+            counts[unit, 0] += 1
+            if counts[unit, value] > 0:
+                self.conflicts -= 1
+        self.cells[row, col] = 0
+        self.empty += 1
+
     def get_row_by_idx(self, row: int) -> np.ndarray:
         return self.cells[row, :]
 
@@ -31,13 +146,10 @@ class Sudoku:
         return self.cells[:, col]
 
     def get_box_by_idx(self, row: int, col: int) -> np.ndarray:
-        i: int = (row // self.box_size) * self.box_size
-        j: int = (col // self.box_size) * self.box_size
-        return self.cells[i : i + self.box_size, j : j + self.box_size]
+        return self.get_box_by_num(int(self.geometry.boxes[row * self.grid_size + col]))
 
     def get_box_by_num(self, box: int) -> np.ndarray:
-        row: int = box // self.box_size * self.box_size
-        col: int = box % self.box_size * self.box_size
+        row, col = self.geometry.box_origins[box].tolist()
         return self.cells[row : row + self.box_size, col : col + self.box_size]
 
     def validate_row_by_idx(self, row: int) -> bool:
@@ -66,14 +178,7 @@ class Sudoku:
         return True
 
     def is_valid(self) -> bool:
-        for i in range(self.grid_size):
-            if not self.validate_row_by_idx(i):
-                return False
-            if not self.validate_col_by_idx(i):
-                return False
-            if not self.validate_box_by_num(i):
-                return False
-        return True
+        return self.conflicts == 0
 
     def is_complete(self) -> bool:
-        return self.is_valid() and np.sum(self.cells == 0) == 0
+        return self.conflicts == 0 and self.empty == 0
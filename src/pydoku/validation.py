@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import numpy as np
+
+from pydoku.geometry import Geometry, cells_geometry
+
+
+def unit_counts(grids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count every value per row, column and box of `(N, cells)` grids.
+
+    Each result has shape `(N, n, n + 1)` with index 0 holding empty cells, and
+    is produced by a single bincount over all grids of the batch.
+    """
+    grids = np.atleast_2d(grids)
+    grids = grids.reshape(grids.shape[0], int(np.prod(grids.shape[1:])))
+    num, num_cells = grids.shape
+    geometry: Geometry = cells_geometry(num_cells)
+    n: int = geometry.grid_size
+    values: np.ndarray = grids.astype(np.intp)
+    offsets: np.ndarray = np.arange(num)[:, None] * n
+    size: int = num * n * (n + 1)
+    return tuple(  # type: ignore[return-value]
+        np.bincount(
+            ((offsets + units) * (n + 1) + values).reshape(-1), minlength=size
+        ).reshape(num, n, n + 1)
+        for units in (geometry.rows, geometry.cols, geometry.boxes)
+    )
+
+
+def count_conflicts(grids: np.ndarray) -> np.ndarray:
+    """Number of extra copies of a value within a unit, per grid."""
+    return sum(  # type: ignore[return-value]
+        np.maximum(counts[:, :, 1:] - 1, 0).sum(axis=(1, 2))
+        for counts in unit_counts(grids)
+    )
+
+
+def validate_many(
+    grids: np.ndarray,
+    solutions: np.ndarray | None = None,
+    complete: bool = True,
+) -> np.ndarray:
+    """Check `(N, cells)` grids at once, returning an `(N,)` boolean mask.
+
+    A grid passes when no unit repeats a value, when it has no empty cells if
+    `complete` is set, and when it equals its row of `solutions` if given.
+    """
+    grids = np.atleast_2d(grids)
+    grids = grids.reshape(grids.shape[0], int(np.prod(grids.shape[1:])))
+    valid: np.ndarray = count_conflicts(grids) == 0
+    if complete:
+        valid &= np.all(grids != 0, axis=1)
+    if solutions is not None:
+        solutions = np.atleast_2d(solutions).reshape(grids.shape[0], -1)
+        valid &= np.all(grids == solutions, axis=1)
+    return valid